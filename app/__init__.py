@@ -1,4 +1,16 @@
 from .mini_app import Event, Worker, WorkerMeta, MyFrame, ui_out_queue, VerticalScrolledFrame, metaclass_resolver, launch_ui, \
-    process_message_from_ui, workers, Subscriber, FileSubscriber, open_file, NewClipboardInfo
+    process_message_from_ui, workers, Subscriber, FileSubscriber, open_file, NewClipboardInfo, Runtime, runtime, \
+    run_headless, bus
+from .bus import Bus
+from .codec import register_codec, encode_event, decode_event, write_event, read_events
+from .manifest import load_manifest, PluginSpec
+from .registry import registry, Registry
+from .tracing import tracer, Tracer, MemorySink, Histogram
+from .sinks import NullSink, CallbackSink, PrintSink, CollectSink
+from .widgets import LogView, LOG_MAX_LINES, KeyedList, MyTreeview, DataGrid, EntryPopup
+from .storage import atomic_write, digest
+from .export import ExportRequest, ExportProgress, ExportWorker, EXPORT_FORMATS
+from .editor import EditorManager, editors
+from .scheduler import SubscriberScheduler, Visibility, visibility
 
-global workers
\ No newline at end of file
+global workers
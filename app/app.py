@@ -2,20 +2,22 @@ import abc
 import asyncio
 import datetime as dt
 import os
-import pdb
 import platform
 import subprocess
 import sys
 import traceback
+from collections import deque
 from queue import Queue
 from threading import Thread
 from tkinter import *
 from tkinter.ttk import *
-from typing import List, Dict, Any, Type, Tuple
+from typing import List, Dict, Any, Type, Tuple, Deque
 
 import pandas as pd
 from pandas.errors import EmptyDataError
 
+from .widgets import LogView, LOG_MAX_LINES, KeyedList
+
 ui_queues: List[Queue] = []
 ui_out_queue = Queue()
 
@@ -661,13 +663,11 @@ class MainContent(Frame):
     def __init__(self, parent, *args, **kwargs):
         Frame.__init__(self, parent)
         Label(self, text='Main content').pack()
-        self.container = VerticalScrolledFrame(self)
+        self.container = LogView(self)
         self.container.pack(expand=True, fill='both')
 
     def add(self, message: str):
-        Label(self.container.interior, text=message).pack()
-        self.container.canvas.update_idletasks()
-        self.container.canvas.yview_moveto(1)
+        self.container.append(message)
 
 
 class TV(Frame):
@@ -692,6 +692,8 @@ class ServerFrame(Frame):
         self.entry = Entry(self, textvariable=self.port)
         self.entry.pack()
         Button(self, text='Create server', command=self.create_server).pack()
+        self.log = LogView(self)
+        self.log.pack(expand=True, fill='both')
 
     def create_server(self):
         self.controller.statusbar.set('Creating server for port ' + self.port.get())
@@ -699,7 +701,7 @@ class ServerFrame(Frame):
         ui_out_queue.put(event)
 
 
-messages_by_peers: Dict[str, List[str]] = {}
+messages_by_peers: Dict[str, Deque[str]] = {}
 
 
 class PeerToPeerFrame(Frame):
@@ -725,21 +727,19 @@ class PeerToPeerFrame(Frame):
         self.container.grid_rowconfigure(0, weight=1)
         self.container.grid_columnconfigure(0, weight=1)
 
-        self.messages_thread_by_addr: Dict[str, VerticalScrolledFrame] = {}
+        self.messages_thread_by_addr: Dict[str, LogView] = {}
         self.name_variable_by_addr: Dict[str, StringVar] = {}
 
         for addr in messages_by_peers:
             if addr not in self.name_variable_by_addr:
                 self.name_variable_by_addr[addr] = StringVar(master=self)
             if addr not in self.messages_thread_by_addr:
-                f = VerticalScrolledFrame(self.container)
+                f = LogView(self.container)
                 self.messages_thread_by_addr[addr] = f
                 f.grid(row=0, column=0, sticky='nsew')
                 Button(self.menubar, textvariable=self.name_variable_by_addr[addr],
                        command=lambda x=addr: self.switch(x)).pack(side=LEFT)
-            messages = messages_by_peers[addr]
-            for message in messages:
-                Label(self.messages_thread_by_addr[addr].interior, text=message).pack()
+            self.messages_thread_by_addr[addr].extend(messages_by_peers[addr])
 
         self._update_button_names(config_ip_rows)
 
@@ -763,21 +763,20 @@ class PeerToPeerFrame(Frame):
         if addr not in self.name_variable_by_addr:
             self.name_variable_by_addr[addr] = StringVar(master=self)
         if addr not in self.messages_thread_by_addr:
-            f = VerticalScrolledFrame(self.container)
+            f = LogView(self.container)
             self.messages_thread_by_addr[addr] = f
             f.grid(row=0, column=0, sticky='nsew')
             Button(self.menubar, textvariable=self.name_variable_by_addr[addr],
                    command=lambda x=addr: self.switch(x)).pack(side=LEFT)
-            messages_by_peers[addr] = []
+        if addr not in messages_by_peers:
+            messages_by_peers[addr] = deque(maxlen=LOG_MAX_LINES)
         f = self.messages_thread_by_addr[addr]
         if port is not None:
             port = 'Me' if port == '8888' else 'Other'
             msg = port + ' : ' + msg
-        Label(f.interior, text=msg).pack()
+        f.append(msg)
         messages_by_peers[addr].append(msg)
         f.tkraise()
-        f.canvas.update_idletasks()
-        f.canvas.yview_moveto(1)
 
     def update_button_names(self, message: IPAddrListChangedEvent):
         self._update_button_names(message.update)
@@ -860,12 +859,11 @@ class TodoFrame(Frame):
         self.container = VerticalScrolledFrame(self)
         Button(self, text="Open file", command=lambda: open_file(TODO_FILE)).pack()
         self.container.pack(expand=True, fill='x')
+        self.todos = KeyedList(self.container.interior)
+        self.todos.pack(fill='x')
 
     def update_todos(self, message: TodoFileUpdate):
-        for item in self.container.interior.winfo_children():
-            item.destroy()
-        for update in message.update:
-            Label(self.container.interior, text=update.strip()).pack()
+        self.todos.set_items(update.strip() for update in message.update)
 
 
 class DoneFrame(Frame):
@@ -882,12 +880,11 @@ class DoneFrame(Frame):
         Button(self, text="Open file", command=lambda: open_file(DONE_FILE)).pack()
         self.container = VerticalScrolledFrame(self)
         self.container.pack(expand=True, fill='x')
+        self.dones = KeyedList(self.container.interior)
+        self.dones.pack(fill='x')
 
     def update_dones(self, message: DoneFileUpdate):
-        for item in self.container.interior.winfo_children():
-            item.destroy()
-        for update in message.update['task'].values:
-            Label(self.container.interior, text=update.strip()).pack()
+        self.dones.set_items(update.strip() for update in message.update['task'].values)
 
     def _update(self):
         now = dt.date.today().strftime('%Y-%m-%d')
@@ -965,55 +962,58 @@ class Main(Frame):
         try:
             while not self.master.queue.empty():
                 message = self.master.queue.get()
-                if type(message) == str:
-                    self.main_content.add(message)
-                if type(message) == StrFromUi:
-                    self.main_content.add(message.message)
-                if type(message) == ServerCreatedEvent:
-                    self.statusbar.set('Processing ServerCreatedEvent...')
-                    Label(self.server_frame, text=message.message).pack()
-                    self.statusbar.set('ServerCreatedEvent processed')
-                if type(message) == MessageFromPeer:
-                    self.statusbar.set('Receiving message from peer')
-                    m = 'FROM ' + message.server + ' -> ' + message.message
-                    Label(self.server_frame, text=m).pack()
-                    self.main_content.add(m)
-                    self.peer_to_peer.get_msg(message.server, message.message)
-                if type(message) == FileUpdateEvent:
-                    m = 'From file : ' + message.update
-                    self.main_content.add(m)
-                # if type(message) == DataFileUpdateEvent:
-                #     self.some_data_frame.update_tree_view(message)
-                if type(message) == IPAddrListChangedEvent:
-                    self.statusbar.set('IP Addr list updating...')
-                    self.config_frame.update_ip_addr_list(message)
-                    self.peer_to_peer.update_button_names(message)
-                    self.statusbar.set('IP Addr list changed')
-                if type(message) == TodoFileUpdate:
-                    self.statusbar.set('Todo file updating...')
-                    self.todo_frame.update_todos(message)
-                    self.statusbar.set('Todo file updated')
-                if type(message) == DoneFileUpdate:
-                    self.statusbar.set('Done file updating...')
-                    self.done_frame.update_dones(message)
-                    self.statusbar.set('Done file updated')
-                if type(message) == ToggleSideBarEvent:
-                    self.navbar_shown = not self.navbar_shown
-                    if not self.navbar_shown:
-                        self.navbar.pack_forget()
-                    else:
-                        self.navbar.pack(side='left', fill='y', after=self.statusbar)
-                if type(message) == NewClipboardInfo:
-                    self.statusbar.set(message.clipboard)
-                for f in self.my_frames:
-                    self.process(f, message)
-        except Exception:
-            extype, val, tb = sys.exc_info()
-            traceback.print_exc()
-            pdb.post_mortem(tb)
+                # a failing frame must not stop the others nor the queue
+                for handler, args in [(self.process_message, (message,))] + \
+                                     [(self.process, (f, message)) for f in self.my_frames]:
+                    try:
+                        handler(*args)
+                    except Exception:
+                        traceback.print_exc()
         finally:
             self.master.after(100, self.process_queue)
 
+    def process_message(self, message):
+        if type(message) == str:
+            self.main_content.add(message)
+        if type(message) == StrFromUi:
+            self.main_content.add(message.message)
+        if type(message) == ServerCreatedEvent:
+            self.statusbar.set('Processing ServerCreatedEvent...')
+            self.server_frame.log.append(message.message)
+            self.statusbar.set('ServerCreatedEvent processed')
+        if type(message) == MessageFromPeer:
+            self.statusbar.set('Receiving message from peer')
+            m = 'FROM ' + message.server + ' -> ' + message.message
+            self.server_frame.log.append(m)
+            self.main_content.add(m)
+            self.peer_to_peer.get_msg(message.server, message.message)
+        if type(message) == FileUpdateEvent:
+            m = 'From file : ' + message.update
+            self.main_content.add(m)
+        # if type(message) == DataFileUpdateEvent:
+        #     self.some_data_frame.update_tree_view(message)
+        if type(message) == IPAddrListChangedEvent:
+            self.statusbar.set('IP Addr list updating...')
+            self.config_frame.update_ip_addr_list(message)
+            self.peer_to_peer.update_button_names(message)
+            self.statusbar.set('IP Addr list changed')
+        if type(message) == TodoFileUpdate:
+            self.statusbar.set('Todo file updating...')
+            self.todo_frame.update_todos(message)
+            self.statusbar.set('Todo file updated')
+        if type(message) == DoneFileUpdate:
+            self.statusbar.set('Done file updating...')
+            self.done_frame.update_dones(message)
+            self.statusbar.set('Done file updated')
+        if type(message) == ToggleSideBarEvent:
+            self.navbar_shown = not self.navbar_shown
+            if not self.navbar_shown:
+                self.navbar.pack_forget()
+            else:
+                self.navbar.pack(side='left', fill='y', after=self.statusbar)
+        if type(message) == NewClipboardInfo:
+            self.statusbar.set(message.clipboard)
+
     def switch_main(self, value):
         frame = self.frames.get(value)
         if frame is not None:
@@ -0,0 +1,81 @@
+from threading import Lock
+from typing import Dict, List, Any, Tuple, Optional
+
+
+class Bus:
+    """Topic based publish/subscribe between the workers and their consumers.
+    * the topics are event types, a subscriber of a type receives its
+      instances and the instances of its subclasses (subscribe to 'object'
+      for everything)
+    * the subscribers of a concrete type are resolved once through its MRO
+      and cached until the subscriptions change
+    * subscribers are anything with 'put' (queues, app.sinks)
+    * None is never published, the last event of each type is kept for the
+      consumers which subscribe later, until its topic loses its last
+      subscriber
+
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.subscribers: Dict[type, List[Any]] = {}
+        self.last: Dict[type, Any] = {}
+        self._routes: Dict[type, Tuple[Any, ...]] = {}
+
+    def subscribe(self, topic: type, subscriber):
+        with self.lock:
+            subscribers = self.subscribers.setdefault(topic, [])
+            if subscriber not in subscribers:
+                subscribers.append(subscriber)
+                self._routes = {}
+
+    def unsubscribe(self, subscriber, topic: type = None):
+        with self.lock:
+            emptied = []
+            for t, subscribers in self.subscribers.items():
+                if (topic is None or t is topic) and subscriber in subscribers:
+                    subscribers.remove(subscriber)
+                    if not subscribers:
+                        emptied.append(t)
+            for t in emptied:
+                del self.subscribers[t]
+            # nobody left to replay them to
+            for t in list(self.last):
+                if any(issubclass(t, e) for e in emptied) and \
+                        not any(m in self.subscribers for m in t.__mro__):
+                    del self.last[t]
+            self._routes = {}
+
+    def route(self, event_type: type) -> Tuple[Any, ...]:
+        routes = self._routes
+        subscribers = routes.get(event_type)
+        if subscribers is None:
+            with self.lock:
+                seen = []
+                for t in event_type.__mro__:
+                    for s in self.subscribers.get(t, ()):
+                        if s not in seen:
+                            seen.append(s)
+                subscribers = routes[event_type] = tuple(seen)
+        return subscribers
+
+    def publish(self, event) -> int:
+        if event is None:
+            return 0
+        self.last[type(event)] = event
+        subscribers = self.route(type(event))
+        for s in subscribers:
+            s.put(event)
+        return len(subscribers)
+
+    # so that a bus can be given where a list of queues is expected
+    put = publish
+
+    def last_of(self, topic: type) -> Optional[Any]:
+        """Last published event of 'topic' (or of a subclass)."""
+        if topic in self.last:
+            return self.last[topic]
+        for t, event in list(self.last.items()):
+            if issubclass(t, topic):
+                return event
+        return None
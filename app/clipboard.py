@@ -0,0 +1,221 @@
+import ctypes
+import ctypes.util
+import logging
+import platform
+import select
+import shutil
+import subprocess
+import threading
+import time
+from typing import Callable, Optional, List
+
+from .storage import digest
+
+logger = logging.getLogger(__name__)
+
+MIN_POLL_INTERVAL = 0.25
+MAX_POLL_INTERVAL = 2.0
+POLL_BACKOFF = 1.5
+# with a notifier but no reader the Tk thread checks 'dirty', backing off to
+# this while nothing is notified
+IDLE_DIRTY_INTERVAL = 1.0
+READ_TIMEOUT = 2
+
+
+# ================= READERS =================
+# read the clipboard without Tk, they return bytes or None
+
+
+def _command_reader(cmd: List[str]) -> Callable[[], Optional[bytes]]:
+    def read():
+        try:
+            p = subprocess.run(cmd, capture_output=True, timeout=READ_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            logger.warning('Clipboard owner did not answer within %s s', READ_TIMEOUT)
+            return None
+        return p.stdout if p.returncode == 0 else None
+
+    return read
+
+
+def _read_windows() -> Optional[bytes]:
+    user32 = ctypes.windll.user32
+    kernel32 = ctypes.windll.kernel32
+    user32.GetClipboardData.restype = ctypes.c_void_p
+    kernel32.GlobalLock.argtypes = [ctypes.c_void_p]
+    kernel32.GlobalLock.restype = ctypes.c_void_p
+    kernel32.GlobalUnlock.argtypes = [ctypes.c_void_p]
+    if not user32.OpenClipboard(None):
+        return None
+    try:
+        handle = user32.GetClipboardData(13)  # CF_UNICODETEXT
+        if not handle:
+            return None
+        p = kernel32.GlobalLock(handle)
+        try:
+            return ctypes.wstring_at(p).encode('utf-8', 'surrogatepass')
+        finally:
+            kernel32.GlobalUnlock(handle)
+    finally:
+        user32.CloseClipboard()
+
+
+def find_reader() -> Optional[Callable[[], Optional[bytes]]]:
+    system = platform.system()
+    if system == 'Windows':
+        return _read_windows
+    if system == 'Darwin':
+        return _command_reader(['pbpaste'])
+    for cmd in (['wl-paste', '--no-newline'], ['xclip', '-selection', 'clipboard', '-o'],
+                ['xsel', '--clipboard', '--output']):
+        if shutil.which(cmd[0]):
+            return _command_reader(cmd)
+    return None
+
+
+# ================= NOTIFIERS =================
+# 'wait(timeout)' returns True when the clipboard changed
+
+
+class XFixesNotifier:
+    """Selection owner change notifications of the X server (XFixes extension)."""
+
+    def __init__(self):
+        x11 = ctypes.cdll.LoadLibrary(ctypes.util.find_library('X11'))
+        xfixes = ctypes.cdll.LoadLibrary(ctypes.util.find_library('Xfixes'))
+        x11.XOpenDisplay.restype = ctypes.c_void_p
+        x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x11.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        x11.XDefaultRootWindow.restype = ctypes.c_ulong
+        x11.XInternAtom.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int]
+        x11.XInternAtom.restype = ctypes.c_ulong
+        x11.XConnectionNumber.argtypes = [ctypes.c_void_p]
+        x11.XPending.argtypes = [ctypes.c_void_p]
+        x11.XNextEvent.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+        x11.XFlush.argtypes = [ctypes.c_void_p]
+        xfixes.XFixesQueryExtension.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int),
+                                                ctypes.POINTER(ctypes.c_int)]
+        xfixes.XFixesSelectSelectionInput.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong,
+                                                      ctypes.c_ulong]
+        self.x11 = x11
+        self.display = x11.XOpenDisplay(None)
+        if not self.display:
+            raise OSError('cannot open display')
+        event_base, error_base = ctypes.c_int(), ctypes.c_int()
+        if not xfixes.XFixesQueryExtension(self.display, ctypes.byref(event_base), ctypes.byref(error_base)):
+            raise OSError('no XFixes extension')
+        self.notify_event = event_base.value  # + XFixesSelectionNotify (0)
+        clipboard = x11.XInternAtom(self.display, b'CLIPBOARD', 0)
+        # XFixesSetSelectionOwnerNotifyMask
+        xfixes.XFixesSelectSelectionInput(self.display, x11.XDefaultRootWindow(self.display), clipboard, 1)
+        x11.XFlush(self.display)
+        self.fd = x11.XConnectionNumber(self.display)
+        self.event = ctypes.create_string_buffer(256)  # > sizeof(XEvent)
+
+    def wait(self, timeout: float) -> bool:
+        if not self.x11.XPending(self.display):
+            select.select([self.fd], [], [], timeout)
+        changed = False
+        while self.x11.XPending(self.display):
+            self.x11.XNextEvent(self.display, self.event)
+            if ctypes.c_int.from_buffer(self.event).value == self.notify_event:
+                changed = True
+        return changed
+
+
+class SequenceNumberNotifier:
+    """Windows clipboard sequence number, a cheap counter read without opening the clipboard."""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.sequence = ctypes.windll.user32.GetClipboardSequenceNumber()
+
+    def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            sequence = ctypes.windll.user32.GetClipboardSequenceNumber()
+            if sequence != self.sequence:
+                self.sequence = sequence
+                return True
+            time.sleep(self.interval)
+        return False
+
+
+def find_notifier():
+    try:
+        if platform.system() == 'Windows':
+            return SequenceNumberNotifier()
+        if platform.system() == 'Linux':
+            return XFixesNotifier()
+    except (OSError, AttributeError, TypeError) as e:
+        logger.info('No clipboard change notifications (%s), polling', e)
+    return None
+
+
+# ================= WATCHER =================
+
+
+class ClipboardWatcher:
+    """Watches the clipboard from a background thread, never from the Tk one.
+    * With a notifier the thread sleeps until the clipboard changes, otherwise
+      it polls, every MIN_POLL_INTERVAL after a change and backing off to
+      MAX_POLL_INTERVAL while nothing changes
+    * With a reader the new content is read here and 'callback(text)' is called
+      when its hash changed (not for the initial content)
+    * Without a reader, 'dirty' is set instead and the Tk thread reads the
+      clipboard itself, only when it was notified of a change
+
+    """
+
+    def __init__(self, callback: Callable[[str], None], reader=None, notifier=None):
+        self.callback = callback
+        self.reader = reader
+        self.notifier = notifier
+        self.state: Optional[bytes] = None
+        self.dirty = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def create(cls, callback: Callable[[str], None]) -> Optional['ClipboardWatcher']:
+        reader = find_reader()
+        notifier = find_notifier()
+        if reader is None and notifier is None:
+            return None
+        return cls(callback, reader, notifier)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='clipboard-watcher')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def check(self, notify: bool = True):
+        data = self.reader()
+        if data is None:
+            return False
+        d = digest(data)
+        if d == self.state:
+            return False
+        self.state = d
+        if notify:
+            self.callback(data.decode('utf-8', 'replace'))
+        return True
+
+    def _run(self):
+        if self.reader is not None:
+            self.check(notify=False)
+        interval = MIN_POLL_INTERVAL
+        while not self._stop.is_set():
+            if self.notifier is not None:
+                if not self.notifier.wait(MAX_POLL_INTERVAL):
+                    continue
+                if self.reader is None:
+                    self.dirty.set()
+                else:
+                    self.check()
+            else:
+                self._stop.wait(interval)
+                interval = MIN_POLL_INTERVAL if self.check() else min(interval * POLL_BACKOFF, MAX_POLL_INTERVAL)
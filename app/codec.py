@@ -0,0 +1,123 @@
+import datetime as dt
+import struct
+import zlib
+from typing import Dict, List, Tuple, Type, Iterator, BinaryIO, Optional
+
+# field kinds: fixed size ones are packed together in one struct, the others are length prefixed
+FIXED_KINDS = {
+    'i': 'q',  # int
+    'f': 'd',  # float
+    '?': '?',  # bool
+    't': 'd',  # datetime, as a POSIX timestamp
+}
+VAR_KINDS = {
+    's',  # str
+    'b',  # bytes
+    'S',  # list of str, without NUL characters, prefixed by the number of items
+}
+_HEADER = struct.Struct('<I')
+_LENGTH = struct.Struct('<I')
+
+
+class Codec:
+    """Binary encoding of one event type, from its declared fields.
+    * 'fields' is a list of (attribute, kind), see FIXED_KINDS and VAR_KINDS
+    * the fixed size fields go first, in one precompiled struct, then the
+      variable ones, each one prefixed by its length
+    * decoding does not call __init__, the fields are set on a new instance
+
+    """
+
+    def __init__(self, cls: Type, fields: List[Tuple[str, str]], tag: int):
+        for name, kind in fields:
+            if kind not in FIXED_KINDS and kind not in VAR_KINDS:
+                raise ValueError(f'Unknown kind {kind!r} for {cls.__name__}.{name}')
+        self.cls = cls
+        self.tag = tag
+        self.fixed = [(name, kind) for name, kind in fields if kind in FIXED_KINDS]
+        self.var = [(name, kind) for name, kind in fields if kind in VAR_KINDS]
+        self.struct = struct.Struct('<' + ''.join(FIXED_KINDS[kind] for _, kind in self.fixed))
+        self.header = _HEADER.pack(tag)
+
+    def encode(self, event) -> bytes:
+        values = []
+        for name, kind in self.fixed:
+            v = getattr(event, name)
+            values.append(v.timestamp() if kind == 't' else v)
+        parts = [self.header, self.struct.pack(*values)]
+        for name, kind in self.var:
+            v = getattr(event, name)
+            if kind == 's':
+                v = v.encode('utf-8', 'surrogatepass')
+            elif kind == 'S':
+                # the count tells [] from ['']
+                parts.append(_LENGTH.pack(len(v)))
+                v = '\0'.join(v).encode('utf-8', 'surrogatepass')
+            parts.append(_LENGTH.pack(len(v)))
+            parts.append(v)
+        return b''.join(parts)
+
+    def decode(self, data: bytes, offset: int = _HEADER.size):
+        event = self.cls.__new__(self.cls)
+        for (name, kind), v in zip(self.fixed, self.struct.unpack_from(data, offset)):
+            setattr(event, name, dt.datetime.fromtimestamp(v) if kind == 't' else v)
+        offset += self.struct.size
+        for name, kind in self.var:
+            if kind == 'S':
+                count, = _LENGTH.unpack_from(data, offset)
+                offset += _LENGTH.size
+            n, = _LENGTH.unpack_from(data, offset)
+            offset += _LENGTH.size
+            v = bytes(data[offset:offset + n])
+            offset += n
+            if kind == 's':
+                v = v.decode('utf-8', 'surrogatepass')
+            elif kind == 'S':
+                v = v.decode('utf-8', 'surrogatepass').split('\0') if count else []
+            setattr(event, name, v)
+        return event
+
+
+codecs_by_type: Dict[Type, Codec] = {}
+codecs_by_tag: Dict[int, Codec] = {}
+
+
+def register_codec(cls: Type, fields: List[Tuple[str, str]], tag: Optional[int] = None) -> Codec:
+    """The default tag is a hash of the qualified class name, so that it is the
+    same in every process importing the class."""
+    if tag is None:
+        tag = zlib.crc32(f'{cls.__module__}.{cls.__qualname__}'.encode())
+    other = codecs_by_tag.get(tag)
+    # a reloaded module registers a new class with the same name
+    if other is not None and (other.cls.__module__, other.cls.__qualname__) != (cls.__module__, cls.__qualname__):
+        raise ValueError(f'Codec tag {tag} of {cls.__name__} already used by {other.cls.__name__}')
+    codecs_by_type[cls] = codecs_by_tag[tag] = codec = Codec(cls, fields, tag)
+    return codec
+
+
+def encode_event(event) -> bytes:
+    return codecs_by_type[type(event)].encode(event)
+
+
+def decode_event(data: bytes):
+    tag, = _HEADER.unpack_from(data)
+    return codecs_by_tag[tag].decode(data)
+
+
+def write_event(f: BinaryIO, event):
+    """Length prefixed record, for captures on disk or streams."""
+    data = encode_event(event)
+    f.write(_LENGTH.pack(len(data)))
+    f.write(data)
+
+
+def read_events(f: BinaryIO) -> Iterator:
+    while True:
+        prefix = f.read(_LENGTH.size)
+        if len(prefix) < _LENGTH.size:
+            return
+        n, = _LENGTH.unpack(prefix)
+        data = f.read(n)
+        if len(data) < n:
+            return
+        yield decode_event(data)
@@ -0,0 +1,119 @@
+import logging
+import os
+import platform
+import subprocess
+import time
+from threading import Thread, Lock
+from typing import Dict, List, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# linux: run in a terminal, '--wait' keeps the launcher until the editor exits
+TERMINAL_EDITOR = ['gnome-terminal', '--wait', '--', 'vim']
+WATCH_INTERVAL = 0.5
+# files are still watched this long after their editor exited (last save)
+WATCH_AFTER_EXIT = 2.0
+# when there is no process to follow (Windows 'startfile')
+WATCH_WITHOUT_PROCESS = 600.0
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class _Watch:
+    def __init__(self, process: Optional[subprocess.Popen], mtime: Optional[int]):
+        self.process = process
+        self.mtime = mtime
+        self.deadline = None if process is not None else time.monotonic() + WATCH_WITHOUT_PROCESS
+
+
+class EditorManager:
+    """Opens files in an editor without blocking the caller.
+    * One editor per file: opening a file whose editor is still running does
+      not start another one
+    * While an editor is open the file's mtime is checked every WATCH_INTERVAL
+      by one thread, every save calls the listeners with the absolute path
+      (the FileSubscribers reading that file poll it right away)
+
+    """
+
+    def __init__(self, command: List[str] = None):
+        self.command = command
+        self.lock = Lock()
+        self.watches: Dict[str, _Watch] = {}
+        self.listeners: List[Callable[[str], None]] = []
+        self._thread: Optional[Thread] = None
+
+    def add_listener(self, listener: Callable[[str], None]):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str], None]):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def open(self, file_name: str) -> Optional[subprocess.Popen]:
+        path = os.path.abspath(file_name)
+        with self.lock:
+            watch = self.watches.get(path)
+            if watch is not None and watch.process is not None and watch.process.poll() is None:
+                logger.info('An editor is already open for %s', path)
+                return watch.process
+            try:
+                process = self._launch(path)
+            except OSError:
+                logger.exception('Could not open an editor for %s', path)
+                return None
+            self.watches[path] = _Watch(process, _mtime(path))
+            if self._thread is None:
+                self._thread = Thread(target=self._watch, name='editor-watch')
+                self._thread.daemon = True
+                self._thread.start()
+        return process
+
+    def _launch(self, path: str) -> Optional[subprocess.Popen]:
+        if self.command is not None:
+            command = self.command + [path]
+        elif platform.system() == 'Darwin':  # macOS
+            command = ['open', '-W', path]
+        elif platform.system() == 'Windows':  # Windows
+            os.startfile(path)
+            return None
+        else:  # linux variants
+            command = TERMINAL_EDITOR + [path]
+        return subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL, start_new_session=True)
+
+    def _watch(self):
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            saved = []
+            with self.lock:
+                now = time.monotonic()
+                for path, watch in list(self.watches.items()):
+                    mtime = _mtime(path)
+                    if mtime != watch.mtime:
+                        watch.mtime = mtime
+                        saved.append(path)
+                    if watch.deadline is None and watch.process.poll() is not None:
+                        watch.deadline = now + WATCH_AFTER_EXIT
+                    elif watch.deadline is not None and now > watch.deadline:
+                        del self.watches[path]
+                done = not self.watches
+                if done:
+                    self._thread = None
+            for path in saved:
+                logger.debug('%s saved', path)
+                for listener in list(self.listeners):
+                    try:
+                        listener(path)
+                    except Exception:
+                        logger.exception('Error in editor listener for %s', path)
+            if done:
+                return
+
+
+editors = EditorManager()
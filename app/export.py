@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import os
+from typing import Any, List, Type, TYPE_CHECKING
+
+from .mini_app import Event, Worker, WorkerMeta, metaclass_resolver
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK = 100_000
+EXPORT_FORMATS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+}
+
+
+class ExportRequest(Event):
+    """Export of the rows 'positions' (in this order) of 'data'. The frame is
+    read from another thread while the export runs: it must not be modified
+    meanwhile (DataGrid sends a copy of its view)."""
+    __slots__ = ('data', 'positions', 'columns', 'path', 'format', 'target')
+
+    def __init__(self, data: 'pd.DataFrame', positions, columns: List[str], path: str, format: str = None,
+                 target: str = None):
+        self.data = data
+        self.positions = positions
+        self.columns = columns
+        self.path = path
+        self.format = format or EXPORT_FORMATS.get(os.path.splitext(path)[1].lower(), 'csv')
+        # widget which asked for it, to route the progress back
+        self.target = target
+
+    @staticmethod
+    def get_repr():
+        return 'ExportRequest'
+
+
+class ExportProgress(Event):
+    __slots__ = ('target', 'path', 'rows', 'total', 'done', 'error')
+
+    def __init__(self, target: str, path: str, rows: int, total: int, done: bool = False, error: str = None):
+        self.target = target
+        self.path = path
+        self.rows = rows
+        self.total = total
+        self.done = done
+        self.error = error
+
+    @staticmethod
+    def get_repr():
+        return 'ExportProgress'
+
+
+class ExportWorker(metaclass_resolver(Worker, WorkerMeta)):
+    """Writes EXPORT_CHUNK rows at a time in an executor thread (the loop stays
+    free), publishing an ExportProgress after each chunk. The file is written
+    next to 'path' and renamed at the end."""
+
+    def get_type(self) -> Type[Event]:
+        return ExportRequest
+
+    async def _process_message(self, message: ExportRequest) -> Any:
+        loop = asyncio.get_event_loop()
+        try:
+            await loop.run_in_executor(None, self.export, message)
+        except Exception as e:
+            logger.exception('Export to %s failed', message.path)
+            return ExportProgress(message.target, message.path, 0, len(message.positions), True, repr(e))
+        return ExportProgress(message.target, message.path, len(message.positions), len(message.positions), True)
+
+    def publish(self, progress: ExportProgress):
+        for q in self.queues:
+            q.put(progress)
+
+    def export(self, message: ExportRequest):
+        total = len(message.positions)
+        part = message.path + '.part'
+        writer = _WRITERS[message.format](part)
+        try:
+            try:
+                for start in range(0, max(total, 1), EXPORT_CHUNK):
+                    chunk = message.data.iloc[message.positions[start:start + EXPORT_CHUNK]][message.columns]
+                    writer.write(chunk)
+                    self.publish(ExportProgress(message.target, message.path, min(start + EXPORT_CHUNK, total),
+                                                total))
+            finally:
+                writer.close()
+            os.replace(part, message.path)
+        except BaseException:
+            if os.path.exists(part):
+                os.unlink(part)
+            raise
+
+
+class _CsvWriter:
+    def __init__(self, path: str):
+        self.f = open(path, 'w', newline='', encoding='utf-8')
+        self.header = True
+
+    def write(self, chunk: 'pd.DataFrame'):
+        chunk.to_csv(self.f, header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        self.f.close()
+
+
+class _ArrowWriter:
+    """Parquet (one row group per chunk) or Arrow IPC file, needs pyarrow."""
+
+    def __init__(self, path: str, parquet: bool):
+        import pyarrow
+        self.pa = pyarrow
+        self.path = path
+        self.parquet = parquet
+        self.writer = None
+        self.schema = None
+
+    def write(self, chunk: 'pd.DataFrame'):
+        table = self.pa.Table.from_pandas(chunk, schema=self.schema, preserve_index=False)
+        if self.writer is None:
+            self.schema = table.schema
+            if self.parquet:
+                import pyarrow.parquet as pq
+                self.writer = pq.ParquetWriter(self.path, self.schema)
+            else:
+                import pyarrow.ipc
+                self.writer = pyarrow.ipc.new_file(self.path, self.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+_WRITERS = {
+    'csv': _CsvWriter,
+    'parquet': lambda path: _ArrowWriter(path, parquet=True),
+    'arrow': lambda path: _ArrowWriter(path, parquet=False),
+}
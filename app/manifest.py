@@ -0,0 +1,45 @@
+import importlib
+import json
+import os
+from typing import List, Optional, Type
+
+MANIFEST_FILE = r'./plugins/manifest.json'
+
+
+class PluginSpec:
+    """One entry of the plugin manifest.
+    * 'name' is the label shown in the navbar
+    * 'module' is only imported when the frame is first shown, or at start
+      up when 'autostart' is set (for plugins whose workers must run from the
+      beginning, like file subscribers)
+    * 'frame' is the MyFrame class name in the module, None for worker only plugins
+    * a disabled plugin is never imported and its workers are never started
+    * the workers of a plugin with a 'process' group run in a child process,
+      one per group, see app.process
+
+    """
+
+    def __init__(self, module: str, name: str = None, frame: Optional[str] = 'F', autostart: bool = False,
+                 enabled: bool = True, process: Optional[str] = None):
+        self.module = module
+        self.name = name if name is not None else module
+        self.frame = frame
+        self.autostart = autostart
+        self.enabled = enabled
+        self.process = process
+
+    def load(self):
+        return importlib.import_module(self.module)
+
+    def get_frame_class(self) -> Type:
+        return getattr(self.load(), self.frame)
+
+    def __repr__(self):
+        return f'PluginSpec({self.module})'
+
+
+def load_manifest(path: str = MANIFEST_FILE) -> List[PluginSpec]:
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        return [PluginSpec(**entry) for entry in json.load(f)]
@@ -1,34 +1,58 @@
 import abc
 import asyncio
 import datetime as dt
+import logging
 import os
-import pdb
-import platform
-import subprocess
 import sys
+import time
 import traceback
-from queue import Queue
-from threading import Thread
+from queue import Queue, Empty
+from threading import Thread, Lock, get_ident, Event as ThreadEvent
 from tkinter import *
 from tkinter.ttk import *
-from typing import List, Dict, Any, Type
+from typing import List, Dict, Any, Type, Set, Optional, Callable
 
-ui_queues: List[Queue] = []
-ui_out_queue = Queue()
+from .bus import Bus
+from .codec import register_codec
+from .editor import editors
+from .clipboard import ClipboardWatcher, MIN_POLL_INTERVAL, MAX_POLL_INTERVAL, POLL_BACKOFF, IDLE_DIRTY_INTERVAL
+from .profiler import SamplingProfiler
+from .registry import registry
+from .scheduler import SubscriberScheduler, visibility
+from .storage import digest
+from .tracing import tracer, Histogram, CREATED, DISPATCHED, WORKER_START, WORKER_END, RENDERED
+
+logger = logging.getLogger(__name__)
+
+
+class TracedQueue(Queue):
+    """Queue stamping what is put in it as just created."""
+
+    def put(self, item, block=True, timeout=None):
+        tracer.stamp(item, CREATED)
+        super().put(item, block, timeout)
+
+
+# results of the workers, the windows subscribe to it
+bus = Bus()
+ui_out_queue = TracedQueue()
 
 NORM_FONT = ("Helvetica", 10)
+PROCESS_QUEUE_INTERVAL = 100
+# time the Tk loop may spend draining its queue before giving a turn to the events
+PROCESS_QUEUE_BUDGET = 0.05
+ERROR_LOG_INTERVAL = 10
+# consecutive errors before a frame stops receiving messages, None to never stop
+CIRCUIT_BREAKER_ERRORS = 5
+CIRCUIT_BREAKER_COOLDOWN = 30
 
 
 # ================= UTIL =================
 
 
 def open_file(file_name):
-    if platform.system() == 'Darwin':  # macOS
-        subprocess.call(('open', file_name))
-    elif platform.system() == 'Windows':  # Windows
-        os.startfile(file_name)
-    else:  # linux variants
-        subprocess.call(['gnome-terminal', '--', 'vim', file_name])
+    """Opens the file in an editor without waiting for it, see app.editor."""
+    editors.open(file_name)
 
 
 def metaclass_resolver(*classes):
@@ -44,6 +68,10 @@ class ToggleSideBarEvent:
 
 
 class Event(metaclass=abc.ABCMeta):
+    """Base of the events, subclasses declare their fields in __slots__ (no per
+    instance __dict__) and register a binary codec for them, see app.codec."""
+    __slots__ = ('_trace',)
+
     @staticmethod
     @abc.abstractmethod
     def get_repr():
@@ -51,6 +79,8 @@ class Event(metaclass=abc.ABCMeta):
 
 
 class NewClipboardInfo(Event):
+    __slots__ = ('clipboard',)
+
     def __init__(self, cp):
         self.clipboard = cp
 
@@ -60,6 +90,8 @@ class NewClipboardInfo(Event):
 
 
 class FileUpdateEvent(Event):
+    __slots__ = ('update',)
+
     def __init__(self, update) -> None:
         self.update = update
 
@@ -68,6 +100,10 @@ class FileUpdateEvent(Event):
         return 'FILE UPDATE'
 
 
+register_codec(NewClipboardInfo, [('clipboard', 's')])
+register_codec(FileUpdateEvent, [('update', 'S')])
+
+
 # ================= WORKERS =================
 
 
@@ -76,6 +112,10 @@ class Worker(metaclass=abc.ABCMeta):
         self.queues = out_queues
         self.in_queue = None
         self.buffer_queue = Queue()
+        # read by the diagnostics frame, from the Tk thread
+        self.processed = 0
+        self.durations = Histogram()
+        self.durations_lock = Lock()
 
     async def tell(self, message):
         if self.in_queue is not None:
@@ -83,20 +123,35 @@ class Worker(metaclass=abc.ABCMeta):
         else:
             self.buffer_queue.put(message)
 
+    def take_durations(self) -> Histogram:
+        """The durations recorded since the last call, from any thread."""
+        with self.durations_lock:
+            durations, self.durations = self.durations, Histogram()
+        return durations
+
     async def start(self):
-        print(f'Worker for {self.get_type().get_repr()} init')
+        logger.info('Worker for %s init', self.get_type().get_repr())
         self.in_queue = asyncio.Queue()
         while not self.buffer_queue.empty():
             await self.tell(self.buffer_queue.get())
         while True:
             message = await self.in_queue.get()
-            print(f'{message} received in {self.get_type().get_repr()}')
+            logger.debug('%s received in %s', message, self.get_type().get_repr())
+            tracer.stamp(message, WORKER_START)
+            t = time.perf_counter_ns()
             try:
                 result = await self._process_message(message)
+                with self.durations_lock:
+                    self.durations.add(time.perf_counter_ns() - t)
+                self.processed += 1
+                tracer.stamp(message, WORKER_END)
+                if result is None:
+                    continue
+                tracer.derive(result, message)
                 for q in self.queues:
                     q.put(result)
-            except Exception as e:
-                print('ERROR : ', e)
+            except Exception:
+                logger.exception('Error in worker for %s', self.get_type().get_repr())
 
     @abc.abstractmethod
     def get_type(self) -> Type[Event]:
@@ -107,22 +162,11 @@ class Worker(metaclass=abc.ABCMeta):
         pass
 
 
-workers: List[Worker] = []
-
-
-def register_instance(inst):
-    global workers
-    workers.append(inst)
-
-
 class M_WorkerMeta(type):
     def __new__(cls, name, base, attrs):
         worker_cls = super().__new__(cls, name, base, attrs)
-        try:
-            w = worker_cls(ui_queues)
-            register_instance(w)
-        except Exception as e:
-            print('ERR Worker META, ', e)
+        if issubclass(worker_cls, Worker):
+            registry.register_worker(worker_cls)
         return worker_cls
 
 
@@ -131,18 +175,28 @@ class WorkerMeta(metaclass=M_WorkerMeta):
 
 
 class Subscriber(Worker):
-    async def _get_from_source(self):
-        await asyncio.sleep(1)
-        while True:
-            update = await self._get_update()
-            if update is not None:
-                await self.tell(update)
-            await asyncio.sleep(self.seconds_before_next_update())
+    """Polls a source with '_get_update', the polls of all the subscribers are
+    scheduled by app.scheduler: coalesced, adaptive around
+    'seconds_before_next_update', paused while no visible frame shows the events."""
+    # False for the subscribers which must keep polling with their frames hidden
+    pausable = True
+
+    def __init__(self, out_queues: List[Queue]):
+        super().__init__(out_queues)
+        self.scheduler: Optional[SubscriberScheduler] = None
 
     async def start(self):
-        loop = asyncio.get_event_loop()
-        loop.create_task(self._get_from_source())
-        await super().start()
+        self.scheduler = SubscriberScheduler.of(asyncio.get_event_loop())
+        self.scheduler.add(self)
+        try:
+            await super().start()
+        finally:
+            self.scheduler.remove(self)
+
+    def wake(self):
+        """Polls the source now instead of at the next period, from any thread."""
+        if self.scheduler is not None:
+            self.scheduler.wake(self)
 
     async def _process_message(self, message) -> Any:
         return message
@@ -164,7 +218,15 @@ class FileSubscriber(Subscriber):
     async def start(self):
         if not os.path.exists(self.get_file_name()):
             open(self.get_file_name(), 'w').close()
-        return await super().start()
+        editors.add_listener(self._on_saved)
+        try:
+            return await super().start()
+        finally:
+            editors.remove_listener(self._on_saved)
+
+    def _on_saved(self, path: str):
+        if path == os.path.abspath(self.get_file_name()):
+            self.wake()
 
     def seconds_before_next_update(self) -> int:
         return 1
@@ -188,57 +250,144 @@ class FileSubscriber(Subscriber):
 
 
 # ================= SET UP =================
-workers_by_type: Dict[str, List[Worker]] = dict()
 config_ip_rows = []
+_STOP = object()
 
 
-async def init_workers():
-    lst = []
-    for w in workers:
-        try:
-            if w.get_type() not in workers_by_type:
-                workers_by_type[w.get_type().get_repr()] = []
-            workers_by_type[w.get_type().get_repr()].append(w)
-            lst.append(w)
-        except AttributeError:
-            pass
-    await asyncio.gather(*[w.start() for w in lst])
+class Runtime:
+    """The worker layer: the dispatcher and every registered worker on one asyncio loop.
+    * Events are read from 'source' (a thread safe queue, 'ui_out_queue' by default),
+      'submit' puts an event there from any thread
+    * The results of the workers are published on 'bus', the one the windows
+      subscribe to by default. Otherwise a new bus where every sink receives
+      every result, see app.sinks for the headless ones
+    * 'run_forever' blocks, 'start' runs it in a daemon thread
+    * the workers of the plugins with a process group run in child processes,
+      supervised from here (see app.process)
 
+    """
 
-async def populate_queue(dispatcher_queue):
-    print("populate_queue")
-    while True:
-        if not ui_out_queue.empty():
-            alert = ui_out_queue.get_nowait()
-            await dispatcher_queue.put(alert)
+    def __init__(self, sinks: List = None, source: Queue = None):
+        if sinks is None:
+            self.bus = bus
         else:
-            await asyncio.sleep(0.5)
-
+            self.bus = Bus()
+            for sink in sinks:
+                self.bus.subscribe(object, sink)
+        self.source = ui_out_queue if source is None else source
+        self.workers: List[Worker] = []
+        self.workers_by_type: Dict[str, List[Worker]] = dict()
+        self.started_worker_classes: Set[type] = set()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread_id: Optional[int] = None
+        self.dispatcher_queue: Optional[asyncio.Queue] = None
+        # set once the workers registered at start up are created
+        self.started = ThreadEvent()
+        self.supervisor = None
+        registry.listeners.append(self._on_worker_registered)
+
+    def submit(self, event: Event):
+        self.source.put(event)
+
+    def _start_worker(self, cls: type):
+        # always called on the runtime loop, so a class is never started twice
+        if cls in self.started_worker_classes or not registry.is_enabled(cls) or not registry.runs_here(cls):
+            return
+        self.started_worker_classes.add(cls)
+        w = cls([self.bus])
+        self.workers.append(w)
+        self.workers_by_type.setdefault(w.get_type().get_repr(), []).append(w)
+        return asyncio.ensure_future(w.start())
+
+    def _on_worker_registered(self, cls: type):
+        # workers of lazily imported plugins are started as soon as they register
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._start_worker, cls)
+
+    async def init_workers(self):
+        tasks = [t for t in [self._start_worker(cls) for cls in list(registry.worker_classes)] if t is not None]
+        self.started.set()
+        await asyncio.gather(*tasks)
+
+    def populate_queue(self):
+        # daemon thread blocked on the source queue, wakes up as soon as something is put
+        logger.debug('populate_queue')
+        while True:
+            alert = self.source.get()
+            if alert is _STOP:
+                return
+            self.loop.call_soon_threadsafe(self.dispatcher_queue.put_nowait, alert)
 
-async def dispatcher(dispatcher_queue):
-    print('Dispatcher init')
-    while True:
-        message: Event = await dispatcher_queue.get()
-        workers = workers_by_type.get(message.get_repr())
-        if workers is not None:
-            for w in workers:
-                await w.tell(message)
-        else:
-            print(f'No worker for type {message.get_repr()}')
+    async def dispatcher(self):
+        logger.debug('Dispatcher init')
+        while True:
+            message: Event = await self.dispatcher_queue.get()
+            tracer.stamp(message, DISPATCHED)
+            workers = self.workers_by_type.get(message.get_repr())
+            if workers is not None:
+                for w in workers:
+                    await w.tell(message)
+            else:
+                logger.warning('No worker for type %s', message.get_repr())
+
+    def run_forever(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self.loop = loop
+        self.thread_id = get_ident()
+
+        self.dispatcher_queue = asyncio.Queue()
+
+        loop.create_task(self.init_workers())
+        loop.create_task(self.dispatcher())
+        pump = Thread(target=self.populate_queue)
+        pump.daemon = True
+        pump.start()
+        groups = registry.process_groups() if registry.process_group is None else {}
+        if groups:
+            from .process import ProcessSupervisor
+            self.supervisor = ProcessSupervisor(self, groups)
+            self.supervisor.start()
+
+        loop.run_forever()
+
+    def start(self) -> Thread:
+        t = Thread(target=self.run_forever)
+        t.daemon = True
+        t.start()
+        return t
+
+    def stop(self):
+        self.source.put(_STOP)
+        if self.supervisor is not None:
+            self.supervisor.stop()
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+runtime = Runtime()
+workers = runtime.workers
+workers_by_type = runtime.workers_by_type
 
 
 def process_message_from_ui():
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    # dispatcher_queue = asyncio.Queue(loop=loop)
-    dispatcher_queue = asyncio.Queue()
+    runtime.run_forever()
 
-    loop.create_task(init_workers())
-    loop.create_task(populate_queue(dispatcher_queue))
-    loop.create_task(dispatcher(dispatcher_queue))
 
-    loop.run_forever()
+def run_headless(sinks: List, plugins: List[str] = None) -> Runtime:
+    """Start the worker layer without any window, results go to 'sinks'.
+    All the enabled plugins are imported (or only 'plugins' when given) since no
+    frame will import them lazily."""
+    if not registry.plugins:
+        registry.discover()
+    if plugins is not None:
+        for module in registry.plugins:
+            if module not in plugins:
+                registry.disable(module)
+    registry.load(parallel=True)
+    r = Runtime(sinks)
+    r.start()
+    return r
 
 
 def get_all_files_subscribers() -> List[FileSubscriber]:
@@ -247,26 +396,70 @@ def get_all_files_subscribers() -> List[FileSubscriber]:
 
 # ================= UI =================
 
+profiler: Optional[SamplingProfiler] = None
 
-frames_ctor = []
-lookup = {}
 
+class FrameGuard:
+    """Error isolation of one frame in the Tk loop.
+    * An exception raised by the frame is recorded, its traceback is logged
+      at most once every ERROR_LOG_INTERVAL seconds
+    * After CIRCUIT_BREAKER_ERRORS consecutive errors the frame is skipped for
+      CIRCUIT_BREAKER_COOLDOWN seconds, then tried again
 
-def register_frame(f):
-    global frames_ctor
-    frames_ctor.append(f)
+    """
 
+    def __init__(self, name: str, on_open: Callable[[str], None] = None):
+        self.name = name
+        self.on_open = on_open
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.suppressed = 0
+        self.skipped = 0
+        self.last_error: Optional[str] = None
+        self.last_logged = None
+        self.open_until = 0.0
+
+    @property
+    def open(self) -> bool:
+        return time.monotonic() < self.open_until
+
+    def call(self, f, *args) -> bool:
+        if self.open:
+            self.skipped += 1
+            return False
+        try:
+            f(*args)
+        except Exception as e:
+            self.record(e)
+            return False
+        self.consecutive_errors = 0
+        return True
+
+    def record(self, e: Exception):
+        now = time.monotonic()
+        self.errors += 1
+        self.consecutive_errors += 1
+        self.last_error = repr(e)
+        if self.last_logged is None or now - self.last_logged >= ERROR_LOG_INTERVAL:
+            logger.error('Error in frame %s (%s not logged since the last one)', self.name, self.suppressed,
+                         exc_info=e)
+            self.last_logged = now
+            self.suppressed = 0
+        else:
+            self.suppressed += 1
+        if CIRCUIT_BREAKER_ERRORS is not None and self.consecutive_errors >= CIRCUIT_BREAKER_ERRORS:
+            self.open_until = now + CIRCUIT_BREAKER_COOLDOWN
+            self.consecutive_errors = 0
+            logger.warning('Frame %s disabled for %s s after %s errors', self.name, CIRCUIT_BREAKER_COOLDOWN,
+                           CIRCUIT_BREAKER_ERRORS)
+            if self.on_open is not None:
+                self.on_open(self.name)
 
-class FrameMeta(type):
-    n = 9
 
+class FrameMeta(type):
     def __new__(cls, name, base, attrs):
         c = super().__new__(cls, name, base, attrs)
-        n = getattr(c, 'get_name')()
-        if n is not None:
-            register_frame(c)
-            lookup[cls.n] = getattr(c, 'get_name')()
-            cls.n = cls.n + 1
+        registry.register_frame(c)
         return c
 
 
@@ -330,18 +523,17 @@ class VerticalScrolledFrame(Frame):
 
 
 class NavBar(Frame):
-    def __init__(self, parent, *args, **kwargs):
+    def __init__(self, parent, names: List[str], *args, **kwargs):
         Frame.__init__(self, parent)
         self.parent = parent
         Label(self, text='=====').pack()
-        self.var = IntVar(master=self)
-        for k in lookup:
-            Radiobutton(self, text=lookup[k], variable=self.var, value=k, command=self.switch).pack()
-        self.var.set(1)
+        self.var = StringVar(master=self)
+        for name in names:
+            Radiobutton(self, text=name, variable=self.var, value=name, command=self.switch).pack()
 
     def switch(self):
         # self.parent.statusbar.set(self.var.get())
-        self.parent.switch_main(lookup[self.var.get()])
+        self.parent.switch_main(self.var.get())
 
 
 class ToolBar(Frame):
@@ -367,27 +559,29 @@ class Main(Frame):
     def __init__(self, parent, *args, **kwargs):
         Frame.__init__(self, parent)
         self.navbar_shown = True
+        # frames are only built the first time they are shown
+        self.frame_factories: Dict[str, Callable[[], Type[MyFrame]]] = {}
+        self.frames: Dict[str, MyFrame] = {}
+        self.my_frames: List[MyFrame] = []
+        self.guards: Dict[MyFrame, FrameGuard] = {}
+        self.frames_by_type: Dict[type, List[MyFrame]] = {}
+        self.load_plugins()
         self.statusbar = StatusBar(self)
         # self.toolbar = ToolBar(self)
-        self.navbar = NavBar(self)
-        container = Frame(self)
+        self.navbar = NavBar(self, list(self.frame_factories))
+        self.container = container = Frame(self)
 
         self.statusbar.pack(side='bottom', fill='x')
         self.navbar.pack(side='left', fill='y')
         container.pack(side='right', fill='both', expand=True)
         container.grid_rowconfigure(0, weight=1)
         container.grid_columnconfigure(0, weight=1)
-        self.load_plugins()
-        self.my_frames = []
-
-        for f_ctor in frames_ctor:
-            f_inst = f_ctor(container, self)
-            f_inst.grid(row=0, column=0, sticky='nsew')
-            self.my_frames.append(f_inst)
 
         menubar = Menu(container)
-        filemenu = Menu(menubar, tearoff=0)
-        filemenu.add_command(label='New window', command=launch_daemon)
+        self.filemenu = filemenu = Menu(menubar, tearoff=0)
+        filemenu.add_command(label='New window', command=self.new_window)
+        filemenu.add_command(label=self._profiler_label(), command=self.toggle_profiler)
+        self.profiler_menu_index = filemenu.index('end')
         filemenu.add_separator()
         filemenu.add_command(label='Exit', command=quit)
         menubar.add_cascade(label='File', menu=filemenu)
@@ -395,77 +589,209 @@ class Main(Frame):
         helpmenu = Menu(menubar, tearoff=0)
         helpmenu.add_command(label='?', command=lambda: popupmsg('Not supported just yet'))
         # menubar.add_cascade(label='Help', menu=helpmenu)
-        menubar.add_command(label='New window', command=launch_daemon)
-
-        Tk.config(self.master, menu=menubar)
+        menubar.add_command(label='New window', command=self.new_window)
 
-        self.frames = {}
-        lframes = []
-        lframes.extend(self.my_frames)
-        for f in zip(lookup.values(), lframes):
-            self.frames[f[0]] = f[1]
+        self.master.config(menu=menubar)
 
+        self.current: Optional[str] = None
         self.switch_main('Main')
+        # the subscribers only poll for the frame shown in a window which is not iconified
+        self.master.bind('<Map>', self._on_map, add='+')
+        self.master.bind('<Unmap>', self._on_map, add='+')
+        self.bind('<Destroy>', self._on_destroy, add='+')
 
-        self.master.after(100, self.process_queue)
+        # drift of the 'after' timer, i.e. how late the Tk loop runs
+        self.loop_lag = Histogram()
+        self.next_tick = time.perf_counter() + PROCESS_QUEUE_INTERVAL / 1000
+        self._after_id = self.master.after(PROCESS_QUEUE_INTERVAL, self.process_queue)
 
     def process_queue(self):
+        start = time.perf_counter()
+        self.loop_lag.add(max(0, int((start - self.next_tick) * 1e9)))
+        interval = PROCESS_QUEUE_INTERVAL
         try:
-            while not self.master.queue.empty():
-                message = self.master.queue.get()
+            while True:
+                if time.perf_counter() - start > PROCESS_QUEUE_BUDGET:
+                    # backlog: come back as soon as Tk handled its own events
+                    interval = 1
+                    break
+                try:
+                    message = self.master.queue.get_nowait()
+                except Empty:
+                    break
                 if type(message) == ToggleSideBarEvent:
                     self.navbar_shown = not self.navbar_shown
                     if not self.navbar_shown:
                         self.navbar.pack_forget()
                     else:
                         self.navbar.pack(side='left', fill='y', after=self.statusbar)
-                for f in self.my_frames:
-                    self.process(f, message)
-        except Exception:
-            extype, val, tb = sys.exc_info()
-            traceback.print_exc()
-            pdb.post_mortem(tb)
+                for t in type(message).__mro__:
+                    for f in self.frames_by_type.get(t, ()):
+                        self.guards[f].call(f.process, message)
+                tracer.stamp(message, RENDERED)
         finally:
-            self.master.after(100, self.process_queue)
+            self.next_tick = time.perf_counter() + interval / 1000
+            if self.winfo_exists():
+                self._after_id = self.master.after(interval, self.process_queue)
 
     def switch_main(self, value):
         frame = self.frames.get(value)
+        if frame is None and value in self.frame_factories:
+            try:
+                frame = self.build_frame(value)
+            except Exception:
+                logger.exception('Cannot build frame %s', value)
+                self.statusbar.set(f'{value} failed to load')
         if frame is not None:
             frame.tkraise()
+            self.current = value
+            self._show_types(frame)
+
+    def build_frame(self, name) -> MyFrame:
+        f_inst = self.frame_factories[name]()(self.container, self)
+        f_inst.grid(row=0, column=0, sticky='nsew')
+        self.frames[name] = f_inst
+        self.my_frames.append(f_inst)
+        self.guards[f_inst] = guard = FrameGuard(name, self._on_frame_disabled)
+        types = f_inst.get_types() or []
+        for t in types:
+            self.frames_by_type.setdefault(t, []).append(f_inst)
+            bus.subscribe(t, self.master.queue)
+            last = bus.last_of(t)
+            if last is not None:
+                guard.call(f_inst.process, last)
+        return f_inst
+
+    def new_window(self):
+        # a child of the root: a Toplevel of another window would be destroyed with it
+        Window(self._root())
+
+    def _on_map(self, event):
+        # the bindings of the window are also run for its widgets
+        if event.widget is not self.master:
+            return
+        if str(event.type) == 'Unmap':
+            visibility.hide(self)
+        else:
+            frame = self.frames.get(self.current)
+            if frame is not None:
+                self._show_types(frame)
+            else:
+                visibility.forget(self)
+
+    def _show_types(self, frame: MyFrame):
+        # a frame without types (diagnostics, text...) shows no event: it pauses nothing
+        types = frame.get_types()
+        if types:
+            visibility.show(self, types)
+        else:
+            visibility.forget(self)
 
-    def process(self, f: MyFrame, e: Event):
-        if type(e) in f.get_types():
-            f.process(e)
+    def _on_destroy(self, event):
+        # however the window goes away, its queue stops being fed and drained
+        if event.widget is self:
+            bus.unsubscribe(self.master.queue)
+            self.master.after_cancel(self._after_id)
+            visibility.forget(self)
+
+    def _on_frame_disabled(self, name):
+        self.statusbar.set(f'{name} paused after errors')
+
+    @staticmethod
+    def _profiler_label():
+        return 'Stop profiling' if profiler is not None and profiler.running else 'Start profiling'
+
+    def toggle_profiler(self):
+        global profiler
+        if profiler is not None and profiler.running:
+            path = profiler.stop()
+            self.statusbar.set('Profile written to ' + path)
+        else:
+            # the Tk thread (this one) and the thread of the worker loop
+            threads = {get_ident(): 'tk'}
+            if runtime.thread_id is not None:
+                threads[runtime.thread_id] = 'runtime'
+            profiler = SamplingProfiler(threads)
+            profiler.start()
+            self.statusbar.set('Profiling...')
+        self.filemenu.entryconfigure(self.profiler_menu_index, label=self._profiler_label())
 
     def load_plugins(self):
-        pass
+        if not registry.plugins:
+            registry.discover()
+        # frames defined outside of the plugins are already imported
+        for f_ctor in registry.frame_classes:
+            if f_ctor.__module__ not in registry.plugins:
+                self.frame_factories[f_ctor.get_name()] = lambda c=f_ctor: c
+        for spec in registry.plugins.values():
+            if spec.frame is not None and spec.enabled:
+                self.frame_factories[spec.name] = spec.get_frame_class
 
 
-class App(Tk):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+clipboard_watcher: Optional[ClipboardWatcher] = None
+
+
+class SideWindow:
+    """What the windows have in common, each one has its own queue, fed by the bus."""
+
+    def init_window(self):
         self.queue = Queue()
-        ui_queues.append(self.queue)
         self.geometry('200x300')
         self.wm_title('Side')
         self.lift()
         self.attributes('-topmost', True)
         self.bind('<Control-t>', self._key)
-        self.clipboard = None
-        self.init = False
-        self.after(1000, self.fetch_clipboard)
 
     def _key(self, event):
         self.queue.put(ToggleSideBarEvent())
 
+
+class App(SideWindow, Tk):
+    """The first window, it owns the Tk interpreter and watches the clipboard."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.init_window()
+        self.clipboard = None
+        self.init = False
+        self.clipboard_interval = MIN_POLL_INTERVAL
+        self.watch_clipboard()
+
+    def watch_clipboard(self):
+        """The clipboard is watched off the Tk thread when the platform allows it, see ClipboardWatcher,
+        'fetch_clipboard' only runs when no reader was found."""
+        global clipboard_watcher
+        if clipboard_watcher is None:
+            clipboard_watcher = ClipboardWatcher.create(lambda text: ui_out_queue.put(NewClipboardInfo(text)))
+            if clipboard_watcher is not None:
+                clipboard_watcher.start()
+        if clipboard_watcher is None or clipboard_watcher.reader is None:
+            self.after(int(self.clipboard_interval * 1000), self.fetch_clipboard)
+
     def fetch_clipboard(self):
+        watcher = clipboard_watcher
+        if watcher is None:
+            changed = self._check_clipboard()
+            idle = MAX_POLL_INTERVAL
+        else:
+            changed = watcher.dirty.is_set() or not self.init
+            if changed:
+                watcher.dirty.clear()
+                self._check_clipboard()
+            idle = IDLE_DIRTY_INTERVAL
+        self.clipboard_interval = MIN_POLL_INTERVAL if changed else min(self.clipboard_interval * POLL_BACKOFF, idle)
+        self.after(int(self.clipboard_interval * 1000), self.fetch_clipboard)
+
+    def _check_clipboard(self) -> bool:
         t = self._get_clipboard()
-        if t != self.clipboard:
-            self.clipboard = t
-            if self.init:
-                ui_out_queue.put(NewClipboardInfo(self.clipboard))
+        d = None if t is None else digest(t.encode('utf-8', 'surrogatepass'))
+        changed = d != self.clipboard
+        if changed:
+            self.clipboard = d
+            if self.init and t is not None:
+                ui_out_queue.put(NewClipboardInfo(t))
         self.init = True
-        self.after(1000, self.fetch_clipboard)
+        return changed
 
     def _get_clipboard(self):
         try:
@@ -480,10 +806,18 @@ def launch_ui():
     r.mainloop()
 
 
-def launch_daemon():
-    t = Thread(target=launch_ui)
-    t.daemon = True
-    t.start()
+class Window(SideWindow, Toplevel):
+    """Other windows: a Toplevel of the same interpreter, run by the same Tk loop."""
+
+    def __init__(self, master, *args, **kwargs):
+        super().__init__(master, *args, **kwargs)
+        self.init_window()
+        self.protocol('WM_DELETE_WINDOW', self.close)
+        Main(self).pack(side='top', fill='both', expand=True)
+
+    def close(self):
+        # Main unsubscribes the queue when it is destroyed
+        self.destroy()
 
 
 def popupmsg(msg):
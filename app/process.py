@@ -0,0 +1,220 @@
+import importlib
+import json
+import logging
+import multiprocessing
+import pickle
+import time
+from multiprocessing.connection import Connection, wait
+from queue import Queue
+from threading import Thread, Lock, Event as ThreadEvent
+from typing import Dict, List, Optional
+
+from .codec import encode_event, decode_event
+from .manifest import PluginSpec
+from .registry import registry
+
+logger = logging.getLogger(__name__)
+
+RESTART_DELAY = 1.0
+MAX_RESTART_DELAY = 30.0
+# a process which ran this long is restarted without delay
+STABLE_AFTER = 60.0
+# a process which did not list its workers by then is killed (and restarted)
+HELLO_TIMEOUT = 30.0
+
+# first byte of every message on the pipes
+_CODEC = b'C'
+_PICKLE = b'P'
+_HELLO = b'H'
+
+
+def dumps(event) -> bytes:
+    """Events with a registered codec are sent in binary, the others pickled."""
+    try:
+        return _CODEC + encode_event(event)
+    except KeyError:
+        return _PICKLE + pickle.dumps(event, pickle.HIGHEST_PROTOCOL)
+
+
+def loads(data: bytes):
+    if data[:1] == _CODEC:
+        return decode_event(memoryview(data)[1:])
+    return pickle.loads(memoryview(data)[1:])
+
+
+class PipeSink:
+    """Sends the results of the workers of a child process back to the main one."""
+
+    def __init__(self, conn: Connection):
+        self.conn = conn
+        self.lock = Lock()
+
+    def put(self, result):
+        data = dumps(result)
+        with self.lock:
+            self.conn.send_bytes(data)
+
+
+def serve(conn: Connection, group: str, modules: List[str]):
+    """Entry point of a worker process: runs the workers of 'modules' in a
+    Runtime of its own, reading events from the pipe and writing results to it."""
+    from .mini_app import Runtime
+    logging.basicConfig(level=logging.INFO)
+    registry.process_group = group
+    for module in modules:
+        registry.plugins[module] = PluginSpec(module, frame=None, process=group)
+        importlib.import_module(module)
+    runtime = Runtime([PipeSink(conn)], source=Queue())
+    runtime.start()
+    runtime.started.wait()
+    conn.send_bytes(_HELLO + json.dumps(list(runtime.workers_by_type)).encode())
+    while True:
+        try:
+            data = conn.recv_bytes()
+        except (EOFError, OSError):
+            # the main process is gone
+            return
+        runtime.submit(loads(data))
+
+
+class RemoteWorker:
+    """Stands for the workers of one process group in the dispatcher of the main process.
+    * 'tell' only queues the event, a sender thread writes it to the pipe, so
+      the asyncio loop never blocks on a full pipe
+    * while the process is restarted the events wait in the queue
+
+    """
+
+    def __init__(self, group: str):
+        self.group = group
+        self.conn: Optional[Connection] = None
+        self.connected = ThreadEvent()
+        self.outbox = Queue()
+        self.in_queue = None
+        # events written to the pipe, results read from it
+        self.sent = 0
+        self.received = 0
+        sender = Thread(target=self._send, name=f'remote-{group}-sender')
+        sender.daemon = True
+        sender.start()
+
+    async def tell(self, message):
+        self.outbox.put(message)
+
+    def _send(self):
+        while True:
+            data = dumps(self.outbox.get())
+            while True:
+                self.connected.wait()
+                try:
+                    self.conn.send_bytes(data)
+                    self.sent += 1
+                    break
+                except (OSError, ValueError):
+                    # broken pipe, the supervisor restarts the process
+                    self.connected.clear()
+
+
+class ProcessSupervisor:
+    """Runs the plugins of each process group ('process' in the manifest) in a
+    child process connected to 'runtime' through a pipe.
+    * events are encoded with app.codec when the type has a codec, pickled otherwise
+    * the results are published on the bus of the runtime
+    * a dead process is restarted, with a delay doubling up to MAX_RESTART_DELAY
+      while it keeps dying
+
+    """
+
+    def __init__(self, runtime, groups: Dict[str, List[str]]):
+        self.runtime = runtime
+        self.groups = groups
+        self.context = multiprocessing.get_context('spawn')
+        self.processes: Dict[str, multiprocessing.Process] = {}
+        self.remotes: Dict[str, RemoteWorker] = {}
+        self.started_at: Dict[str, float] = {}
+        self.delays: Dict[str, float] = {}
+        self.restarts = 0
+        self._stop = ThreadEvent()
+
+    def start(self) -> Thread:
+        t = Thread(target=self._supervise, name='process-supervisor')
+        t.daemon = True
+        t.start()
+        return t
+
+    def stop(self):
+        self._stop.set()
+        for p in self.processes.values():
+            p.terminate()
+
+    def _spawn(self, group: str):
+        parent_conn, child_conn = self.context.Pipe()
+        p = self.context.Process(target=serve, args=(child_conn, group, self.groups[group]),
+                                 name=f'workers-{group}')
+        p.daemon = True
+        p.start()
+        child_conn.close()
+        self.processes[group] = p
+        self.started_at[group] = time.monotonic()
+        try:
+            if not parent_conn.poll(HELLO_TIMEOUT):
+                # stuck importing its plugins: its exit goes through the restart delay
+                logger.error('Worker process %s did not start within %s s', group, HELLO_TIMEOUT)
+                p.kill()
+                parent_conn.close()
+                return
+            data = parent_conn.recv_bytes()
+        except (EOFError, OSError):
+            logger.error('Worker process %s died at start up', group)
+            parent_conn.close()
+            return
+        remote = self.remotes.get(group)
+        if remote is None:
+            remote = self.remotes[group] = RemoteWorker(group)
+        for repr_ in json.loads(data[len(_HELLO):]):
+            workers = self.runtime.workers_by_type.setdefault(repr_, [])
+            if remote not in workers:
+                workers.append(remote)
+        remote.conn = parent_conn
+        remote.connected.set()
+        reader = Thread(target=self._read, args=(parent_conn, remote), name=f'remote-{group}-reader')
+        reader.daemon = True
+        reader.start()
+        logger.info('Worker process %s started (pid %s)', group, p.pid)
+
+    def _read(self, conn: Connection, remote: RemoteWorker):
+        while True:
+            try:
+                data = conn.recv_bytes()
+            except (EOFError, OSError):
+                return
+            remote.received += 1
+            self.runtime.bus.publish(loads(data))
+
+    def _supervise(self):
+        for group in self.groups:
+            self._spawn(group)
+        while not self._stop.is_set():
+            sentinels = {p.sentinel: group for group, p in self.processes.items()}
+            for sentinel in wait(list(sentinels), timeout=1):
+                if self._stop.is_set():
+                    return
+                group = sentinels[sentinel]
+                self.processes[group].join(1)
+                remote = self.remotes.get(group)
+                if remote is not None:
+                    remote.connected.clear()
+                    if remote.conn is not None:
+                        # ends its reader thread, the next process gets a new pipe
+                        remote.conn.close()
+                if time.monotonic() - self.started_at[group] > STABLE_AFTER:
+                    delay = 0
+                    self.delays.pop(group, None)
+                else:
+                    delay = self.delays.get(group, RESTART_DELAY)
+                    self.delays[group] = min(delay * 2, MAX_RESTART_DELAY)
+                logger.error('Worker process %s exited with code %s, restarting in %s s', group,
+                             self.processes[group].exitcode, delay)
+                self._stop.wait(delay)
+                self.restarts += 1
+                self._spawn(group)
@@ -0,0 +1,64 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+SAMPLING_INTERVAL = 0.01
+
+
+class SamplingProfiler:
+    """Statistical profiler of a few threads, run from a background thread.
+    * Every 'interval' seconds the current stack of each profiled thread is
+      read with sys._current_frames, nothing is hooked in the profiled threads
+    * 'stop' writes the samples in the collapsed stack format
+      ('thread;outer;inner count' per line), which flamegraph.pl and
+      speedscope read directly
+
+    """
+
+    def __init__(self, threads: Dict[int, str], interval: float = SAMPLING_INTERVAL):
+        self.threads = threads
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self.samples.clear()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, path: str = None) -> str:
+        self._stop.set()
+        self._thread.join()
+        if path is None:
+            path = 'profile-{}.folded'.format(time.strftime('%Y%m%d-%H%M%S'))
+        self.write(path)
+        return path
+
+    def write(self, path: str):
+        with open(path, 'w') as f:
+            for stack, n in self.samples.most_common():
+                f.write(f'{stack} {n}\n')
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id, name in self.threads.items():
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                    frame = frame.f_back
+                if stack:
+                    stack.append(name)
+                    self.samples[';'.join(reversed(stack))] += 1
@@ -0,0 +1,94 @@
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Callable, Optional
+
+from .manifest import PluginSpec, load_manifest, MANIFEST_FILE
+
+ENTRY_POINT_GROUP = 'sideui.plugins'
+
+
+def entry_point_specs() -> List[PluginSpec]:
+    """Plugins of installed distributions, declared as
+    [options.entry_points] sideui.plugins = Name = package.module[:FrameClass]"""
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # python < 3.8
+        return []
+    eps = entry_points()
+    eps = eps.select(group=ENTRY_POINT_GROUP) if hasattr(eps, 'select') else eps.get(ENTRY_POINT_GROUP, [])
+    specs = []
+    for ep in eps:
+        module, _, frame = ep.value.partition(':')
+        specs.append(PluginSpec(module.strip(), name=ep.name, frame=frame.strip() or 'F'))
+    return specs
+
+
+class Registry:
+    """Plugins, worker classes and frame classes known to the application.
+    * Defining a Worker or MyFrame subclass only records the class here,
+      abstract classes and frames without a name are ignored
+    * Workers are instantiated by the runtime (Runtime._start_worker) for the
+      classes registered when it starts, then for each new one through 'listeners'
+    * Plugins come from the manifest and from the 'sideui.plugins' entry points,
+      they can be enabled/disabled before the runtime and the UI start
+
+    """
+
+    def __init__(self):
+        self.plugins: Dict[str, PluginSpec] = {}
+        self.worker_classes: List[type] = []
+        self.frame_classes: List[type] = []
+        self.listeners: List[Callable[[type], None]] = []
+        # process group of the workers run by this process, None in the main one
+        self.process_group: Optional[str] = None
+
+    def discover(self, manifest: str = MANIFEST_FILE) -> List[PluginSpec]:
+        for spec in load_manifest(manifest) + entry_point_specs():
+            self.plugins.setdefault(spec.module, spec)
+        return list(self.plugins.values())
+
+    def enable(self, module: str):
+        self.plugins[module].enabled = True
+
+    def disable(self, module: str):
+        self.plugins[module].enabled = False
+
+    def is_enabled(self, cls: type) -> bool:
+        # classes which are not part of a plugin are always enabled
+        spec = self.plugins.get(cls.__module__)
+        return spec is None or spec.enabled
+
+    def runs_here(self, cls: type) -> bool:
+        spec = self.plugins.get(cls.__module__)
+        return (spec.process if spec is not None else None) == self.process_group
+
+    def process_groups(self) -> Dict[str, List[str]]:
+        groups = {}
+        for spec in self.plugins.values():
+            if spec.enabled and spec.process is not None:
+                groups.setdefault(spec.process, []).append(spec.module)
+        return groups
+
+    def load(self, autostart_only: bool = False, parallel: bool = False):
+        specs = [spec for spec in self.plugins.values() if spec.enabled and (spec.autostart or not autostart_only)]
+        if parallel and len(specs) > 1:
+            with ThreadPoolExecutor(max_workers=len(specs)) as executor:
+                list(executor.map(PluginSpec.load, specs))
+        else:
+            for spec in specs:
+                spec.load()
+
+    def register_worker(self, cls: type):
+        if inspect.isabstract(cls) or cls in self.worker_classes:
+            return
+        self.worker_classes.append(cls)
+        for listener in self.listeners:
+            listener(cls)
+
+    def register_frame(self, cls: type):
+        if cls.get_name() is None or cls in self.frame_classes:
+            return
+        self.frame_classes.append(cls)
+
+
+registry = Registry()
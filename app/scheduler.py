@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import weakref
+from threading import Lock
+from typing import Dict, Hashable, Iterable, Set, Optional
+
+logger = logging.getLogger(__name__)
+
+FIRST_POLL_DELAY = 1.0
+# subscribers due within this delay are polled in the same wakeup
+COALESCE = 0.25
+# after an update the next poll comes sooner, each idle poll waits longer
+ACTIVE_FACTOR = 0.5
+IDLE_BACKOFF = 1.5
+MAX_IDLE_FACTOR = 4
+MIN_INTERVAL = 0.25
+
+
+class Visibility:
+    """Event types shown by the UI: each window ('owner') tells the types of the
+    frame on screen, no types while it is iconified. Without any owner (headless)
+    every type is wanted."""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.owners: Dict[Hashable, Set[type]] = {}
+
+    def show(self, owner: Hashable, types: Iterable[type]):
+        with self.lock:
+            self.owners[owner] = set(types)
+        self._changed()
+
+    def hide(self, owner: Hashable):
+        self.show(owner, ())
+
+    def forget(self, owner: Hashable):
+        with self.lock:
+            self.owners.pop(owner, None)
+        self._changed()
+
+    def wants(self, event_type: type) -> bool:
+        with self.lock:
+            if not self.owners:
+                return True
+            return any(issubclass(event_type, t) for types in self.owners.values() for t in types)
+
+    @staticmethod
+    def _changed():
+        for scheduler in list(SubscriberScheduler.schedulers.values()):
+            scheduler.refresh()
+
+
+visibility = Visibility()
+
+
+class _Entry:
+    def __init__(self, subscriber, due: float):
+        self.subscriber = subscriber
+        self.interval = subscriber.seconds_before_next_update()
+        self.due = due
+        self.paused = False
+        self.polling = False
+        # polled even when paused
+        self.woken = False
+
+
+class SubscriberScheduler:
+    """Polls the Subscribers of one asyncio loop, scheduled from a single task.
+    * The subscribers due at about the same time are polled in one wakeup
+      (COALESCE), concurrently: a slow source does not delay the others. The
+      task sleeps until the next one is due
+    * The period of a subscriber ('seconds_before_next_update') is its base:
+      it polls faster after an update and backs off up to MAX_IDLE_FACTOR times
+      the base while nothing changes
+    * A subscriber is paused while no visible frame shows its events (see
+      Visibility) unless its 'pausable' is False, it polls at once when resumed
+    * 'wake' polls a subscriber now, from any thread
+
+    """
+    schedulers: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, SubscriberScheduler]' = \
+        weakref.WeakKeyDictionary()
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.entries: Dict[int, _Entry] = {}
+        self._wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        # polls running, referenced until they end
+        self._polls: Set[asyncio.Task] = set()
+        # read by the diagnostics and the benchmarks
+        self.wakeups = 0
+        self.polls = 0
+
+    @classmethod
+    def of(cls, loop: asyncio.AbstractEventLoop) -> 'SubscriberScheduler':
+        scheduler = cls.schedulers.get(loop)
+        if scheduler is None:
+            scheduler = cls.schedulers[loop] = cls(loop)
+        return scheduler
+
+    def add(self, subscriber):
+        """To be called on the loop."""
+        entry = self.entries[id(subscriber)] = _Entry(subscriber, self.loop.time() + FIRST_POLL_DELAY)
+        entry.paused = self._paused(subscriber)
+        if self.task is None:
+            self.task = self.loop.create_task(self.run())
+        self._wakeup.set()
+
+    def remove(self, subscriber):
+        self.entries.pop(id(subscriber), None)
+
+    def wake(self, subscriber=None):
+        """Polls 'subscriber' (all of them when None) as soon as possible."""
+        self._call(self._wake, subscriber)
+
+    def refresh(self):
+        """Pauses or resumes the subscribers after a change of the visible types."""
+        self._call(self._refresh)
+
+    def _call(self, f, *args):
+        try:
+            self.loop.call_soon_threadsafe(f, *args)
+        except RuntimeError:  # the loop is closed
+            pass
+
+    def _wake(self, subscriber):
+        for entry in self.entries.values():
+            if subscriber is None or entry.subscriber is subscriber:
+                entry.due = self.loop.time()
+                entry.interval = entry.subscriber.seconds_before_next_update()
+                entry.woken = True
+        self._wakeup.set()
+
+    def _refresh(self):
+        now = self.loop.time()
+        for entry in self.entries.values():
+            paused = self._paused(entry.subscriber)
+            if entry.paused and not paused:
+                entry.due = now
+            entry.paused = paused
+        self._wakeup.set()
+
+    @staticmethod
+    def _paused(subscriber) -> bool:
+        return subscriber.pausable and not visibility.wants(subscriber.get_type())
+
+    async def run(self):
+        while True:
+            now = self.loop.time()
+            ready = [e for e in self.entries.values() if not e.polling and (not e.paused or e.woken)]
+            # the ones due soon ride along, only when one is due now (not when a poll ends)
+            due = [e for e in ready if e.due <= now + COALESCE] if any(e.due <= now for e in ready) else []
+            if due:
+                self.wakeups += 1
+            for entry in due:
+                # set now, the task starts later: the next wakeup must not poll it again
+                entry.polling = True
+                task = self.loop.create_task(self._poll(entry))
+                self._polls.add(task)
+                task.add_done_callback(self._polls.discard)
+            times = [e.due for e in self.entries.values() if (not e.paused or e.woken) and not e.polling]
+            self._wakeup.clear()
+            timeout = max(0.0, min(times) - self.loop.time()) if times else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self, entry: _Entry):
+        subscriber = entry.subscriber
+        entry.polling = True
+        entry.woken = False
+        self.polls += 1
+        update = None
+        try:
+            update = await subscriber._get_update()
+            if update is not None:
+                await subscriber.tell(update)
+        except Exception:
+            logger.exception('Error in subscriber for %s', subscriber.get_type().get_repr())
+        finally:
+            entry.polling = False
+        base = subscriber.seconds_before_next_update()
+        if update is not None:
+            entry.interval = max(MIN_INTERVAL, base * ACTIVE_FACTOR)
+        else:
+            entry.interval = min(max(entry.interval, MIN_INTERVAL) * IDLE_BACKOFF, base * MAX_IDLE_FACTOR)
+        # woken during the poll (e.g. a save while the file was read): poll again now
+        entry.due = self.loop.time() + (0 if entry.woken else entry.interval)
+        # the sleep of 'run' did not count this entry
+        self._wakeup.set()
@@ -0,0 +1,36 @@
+from collections import deque, Counter
+from typing import Callable, Any
+
+
+class NullSink:
+    """Drops every result, to measure the worker layer alone."""
+
+    def put(self, result):
+        pass
+
+
+class CallbackSink:
+    """Calls 'callback' with every result, on the runtime thread."""
+
+    def __init__(self, callback: Callable[[Any], None]):
+        self.callback = callback
+
+    def put(self, result):
+        self.callback(result)
+
+
+class PrintSink(CallbackSink):
+    def __init__(self):
+        super().__init__(print)
+
+
+class CollectSink:
+    """Keeps the last 'maxlen' results and counts them by type."""
+
+    def __init__(self, maxlen: int = 10000):
+        self.results = deque(maxlen=maxlen)
+        self.counts = Counter()
+
+    def put(self, result):
+        self.results.append(result)
+        self.counts[type(result).__name__] += 1
@@ -0,0 +1,31 @@
+import hashlib
+import os
+import stat
+import tempfile
+
+
+def atomic_write(path: str, data, mode: str = 'w', **kwargs):
+    """Writes a temporary file next to 'path' and renames it over 'path': readers,
+    and 'path' after a crash, only ever see the old or the new content."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix='.' + os.path.basename(path))
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            os.chmod(tmp, stat.S_IMODE(os.stat(path).st_mode))
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp, 0o666 & ~umask)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def digest(data: bytes) -> bytes:
+    """Short hash to compare or key contents without keeping them (clipboard,
+    clip history, text journal)."""
+    return hashlib.blake2b(data, digest_size=16).digest()
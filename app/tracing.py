@@ -0,0 +1,138 @@
+import time
+from collections import defaultdict
+from threading import Lock
+from typing import Dict, Tuple, Any
+
+CREATED = 'created'
+DISPATCHED = 'dispatched'
+WORKER_START = 'worker_start'
+WORKER_END = 'worker_end'
+RENDERED = 'rendered'
+STAGES = (CREATED, DISPATCHED, WORKER_START, WORKER_END, RENDERED)
+
+# bucket i holds the durations in [2**(i-1), 2**i) microseconds, the last one is open
+N_BUCKETS = 28
+
+
+class Histogram:
+    """Power of two buckets of durations, constant memory and O(1) record."""
+
+    def __init__(self):
+        self.buckets = [0] * N_BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+
+    def add(self, duration_ns: int):
+        self.buckets[min((duration_ns // 1000).bit_length(), N_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total_ns += duration_ns
+        if self.min_ns is None or duration_ns < self.min_ns:
+            self.min_ns = duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def percentile(self, q: float) -> float:
+        """Upper bound (ms) of the bucket holding the q-th percentile."""
+        if self.count == 0:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return min(2 ** i / 1000, self.max_ns / 1e6)
+        return self.max_ns / 1e6
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ns / self.count / 1e6 if self.count else 0.0,
+            'min_ms': (self.min_ns or 0) / 1e6,
+            'p50_ms': self.percentile(50),
+            'p90_ms': self.percentile(90),
+            'p99_ms': self.percentile(99),
+            'max_ms': self.max_ns / 1e6,
+        }
+
+
+class MemorySink:
+    """Default sink, keeps counters and histograms in memory."""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.counters: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.histograms: Dict[Tuple[str, str], Histogram] = defaultdict(Histogram)
+
+    def count(self, event_type: str, stage: str):
+        with self.lock:
+            self.counters[(event_type, stage)] += 1
+
+    def record(self, event_type: str, span: str, duration_ns: int):
+        with self.lock:
+            self.histograms[(event_type, span)].add(duration_ns)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'counters': {f'{t}/{s}': n for (t, s), n in self.counters.items()},
+                'histograms': {f'{t}/{s}': h.summary() for (t, s), h in self.histograms.items()},
+            }
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+
+class Tracer:
+    """Stamps events as they go through the pipeline.
+    * Every stamp increments the (event type, stage) counter
+    * The time spent since the previous stamp of the same event is recorded
+      as the 'previous->stage' span, the time since creation as 'total->stage'
+    * Stamps are stored on the event itself ('_trace'), objects which cannot
+      hold attributes (str...) are only counted
+    * 'sink' is anything with 'count' and 'record', see MemorySink
+
+    """
+
+    def __init__(self, sink=None, enabled: bool = True):
+        self.sink = MemorySink() if sink is None else sink
+        self.enabled = enabled
+
+    def stamp(self, event, stage: str):
+        if not self.enabled or event is None:
+            return
+        now = time.perf_counter_ns()
+        event_type = type(event).__name__
+        self.sink.count(event_type, stage)
+        trace = getattr(event, '_trace', None)
+        if trace is None:
+            try:
+                event._trace = trace = {}
+            except AttributeError:
+                return
+        elif trace:
+            last_stage, last = trace['last']
+            self.sink.record(event_type, f'{last_stage}->{stage}', now - last)
+            created = trace.get(CREATED)
+            if created is not None and last_stage != CREATED:
+                self.sink.record(event_type, f'total->{stage}', now - created)
+        trace.setdefault(stage, now)
+        trace['last'] = (stage, now)
+
+    def derive(self, result, source):
+        """'result' was produced from 'source': it inherits its creation time."""
+        if not self.enabled or result is None or result is source:
+            return
+        created = getattr(source, '_trace', {}).get(CREATED)
+        if created is None:
+            return
+        try:
+            result._trace = {CREATED: created, 'last': (CREATED, created)}
+        except AttributeError:
+            pass
+
+
+tracer = Tracer()
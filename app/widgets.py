@@ -0,0 +1,753 @@
+import datetime as dt
+from bisect import bisect_left
+from collections import deque, Counter
+from functools import partial
+from tkinter import *
+from tkinter import filedialog
+from tkinter.ttk import *
+from typing import Iterable, List, Dict, Hashable, Callable, Any, Set, Tuple, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+LOG_MAX_LINES = 1000
+
+
+class LogView(Frame):
+    """A bounded, append-only log view.
+    * Messages are kept in a ring buffer of at most 'max_lines' entries,
+      the oldest ones are evicted from the buffer and from the widget
+    * Everything is drawn by a single Text widget, which only renders
+      the visible lines, so the widget count stays constant
+    * The view follows new messages unless the user scrolled up
+
+    """
+
+    def __init__(self, parent, max_lines: int = LOG_MAX_LINES, height: int = 1, *args, **kw):
+        Frame.__init__(self, parent, *args, **kw)
+        self.lines = deque(maxlen=max_lines)
+        self.vscrollbar = vscrollbar = Scrollbar(self, orient=VERTICAL)
+        vscrollbar.pack(fill=Y, side=RIGHT, expand=FALSE)
+        self.text = Text(self, wrap='word', state='disabled', width=1, height=height,
+                         borderwidth=0, highlightthickness=0, yscrollcommand=vscrollbar.set)
+        self.text.pack(side=LEFT, fill=BOTH, expand=TRUE)
+        vscrollbar.config(command=self.text.yview)
+
+    @property
+    def max_lines(self) -> int:
+        return self.lines.maxlen
+
+    def append(self, message):
+        self.extend([message])
+
+    def extend(self, messages: Iterable):
+        messages = [str(m) for m in messages][-self.max_lines:]
+        if not messages:
+            return
+        follow = self.text.yview()[1] >= 1.0
+        self.text.configure(state='normal')
+        overflow = len(self.lines) + len(messages) - self.max_lines
+        if overflow > 0:
+            # number of Text lines taken by the messages about to be evicted
+            n = sum(self.lines[i].count('\n') + 1 for i in range(min(overflow, len(self.lines))))
+            self.text.delete('1.0', f'{n + 1}.0')
+        self.lines.extend(messages)
+        self.text.insert('end-1c', ''.join(m + '\n' for m in messages))
+        self.text.configure(state='disabled')
+        if follow:
+            self.text.see('end')
+
+    def clear(self):
+        self.lines.clear()
+        self.text.configure(state='normal')
+        self.text.delete('1.0', 'end')
+        self.text.configure(state='disabled')
+
+
+def _stable_positions(seq: List[int]) -> Set[int]:
+    """Indexes of a longest increasing subsequence of 'seq' (-1 entries are skipped),
+    i.e. the items that can stay where they are."""
+    tails: List[int] = []
+    tails_idx: List[int] = []
+    prev = [-1] * len(seq)
+    for i, v in enumerate(seq):
+        if v < 0:
+            continue
+        j = bisect_left(tails, v)
+        if j == len(tails):
+            tails.append(v)
+            tails_idx.append(i)
+        else:
+            tails[j] = v
+            tails_idx[j] = i
+        prev[i] = tails_idx[j - 1] if j > 0 else -1
+    stable = set()
+    i = tails_idx[-1] if tails_idx else -1
+    while i >= 0:
+        stable.add(i)
+        i = prev[i]
+    return stable
+
+
+class KeyedList(Frame):
+    """A vertical list of widgets reconciled against a new list of items.
+    * 'set_items' reuses the widget of every item already shown, destroys the
+      ones that disappeared, creates the new ones and only re-packs the widgets
+      that actually moved
+    * Items are matched by 'key(item)', duplicates by their occurrence number
+    * Override 'create' to build something else than a Label
+
+    """
+
+    def __init__(self, parent, key: Callable[[Any], Hashable] = lambda item: item, *args, **kw):
+        Frame.__init__(self, parent, *args, **kw)
+        self._init_state(key)
+        # zero sized anchor so that every item can be packed 'after' something
+        self._head = Frame(self, height=0)
+        self._head.pack()
+
+    def _init_state(self, key: Callable[[Any], Hashable]):
+        self.key = key
+        self.keys: List[Tuple[Hashable, int]] = []
+        self.widgets: Dict[Tuple[Hashable, int], Widget] = {}
+
+    def create(self, item) -> Widget:
+        return Label(self, text=item)
+
+    def set_items(self, items: Iterable):
+        items = list(items)
+        occurrences = Counter()
+        new_keys = []
+        for item in items:
+            k = self.key(item)
+            new_keys.append((k, occurrences[k]))
+            occurrences[k] += 1
+        new_set = set(new_keys)
+
+        for k in self.keys:
+            if k not in new_set:
+                self.widgets.pop(k).destroy()
+        old_pos = {k: i for i, k in enumerate(self.keys) if k in new_set}
+        seq = [old_pos.get(k, -1) for k in new_keys]
+        kept = [v for v in seq if v >= 0]
+        if all(kept[i] < kept[i + 1] for i in range(len(kept) - 1)):
+            stable = set(range(len(seq)))  # only inserts and removals, nothing moved
+        else:
+            stable = _stable_positions(seq)
+
+        prev = self._head
+        for i, (k, item) in enumerate(zip(new_keys, items)):
+            w = self.widgets.get(k)
+            if w is None:
+                w = self.widgets[k] = self.create(item)
+                w.pack(after=prev)
+            elif i not in stable:
+                w.pack(after=prev)
+            prev = w
+        self.keys = new_keys
+
+
+class MyTreeview(Treeview):
+    def heading(self, column, sort_by=None, **kwargs):
+        if sort_by and not hasattr(kwargs, 'command'):
+            func = getattr(self, f"_sort_by_{sort_by}", None)
+            if func:
+                kwargs['command'] = partial(func, column, False)
+            # End of if
+        # End of if
+        return super().heading(column, **kwargs)
+
+    # End of heading()
+
+    def _sort(self, column, reverse, data_type, callback):
+        l = [(self.set(k, column), k) for k in self.get_children('')]
+        l.sort(key=lambda t: data_type(t[0]), reverse=reverse)
+        for index, (_, k) in enumerate(l):
+            self.move(k, '', index)
+        # End of for loop
+        self.heading(column, command=partial(callback, column, not reverse))
+
+    # End of _sort()
+
+    def _sort_by_num(self, column, reverse):
+        self._sort(column, reverse, int, self._sort_by_num)
+
+    # End of _sort_by_num()
+
+    def _sort_by_name(self, column, reverse):
+        self._sort(column, reverse, str, self._sort_by_name)
+
+    # End of _sort_by_num()
+
+    def _sort_by_date(self, column, reverse):
+        def _str_to_datetime(string):
+            return dt.datetime.strptime(string, "%Y-%m-%d")
+
+        # End of _str_to_datetime()
+
+        self._sort(column, reverse, _str_to_datetime, self._sort_by_date)
+
+    # End of _sort_by_num()
+
+    def _sort_by_multidecimal(self, column, reverse):
+        def _multidecimal_to_str(string):
+            arrString = string.split(".")
+            strNum = ""
+            for iValue in arrString:
+                strValue = f"{int(iValue):02}"
+                strNum = "".join([strNum, str(strValue)])
+            # End of for loop
+            strNum = "".join([strNum, "0000000"])
+            return int(strNum[:8])
+
+        # End of _multidecimal_to_str()
+
+        self._sort(column, reverse, _multidecimal_to_str, self._sort_by_multidecimal)
+
+    # End of _sort_by_num()
+
+    def _sort_by_numcomma(self, column, reverse):
+        def _numcomma_to_num(string):
+            return int(string.replace(",", ""))
+
+        # End of _numcomma_to_num()
+
+        self._sort(column, reverse, _numcomma_to_num, self._sort_by_numcomma)
+    # End of _sort_by_num()
+
+
+# End of class MyTreeview
+
+
+GRID_ROWS = 20
+# edits (or batches of edits) which can be undone
+UNDO_LIMIT = 100
+STAT_NAMES = ('sum', 'count', 'min', 'max')
+
+
+class DataGrid(Frame):
+    """Virtualized grid over a DataFrame (pandas is only imported with the data).
+    * The Treeview only holds the visible rows, a pool of items refilled when
+      scrolling: the widget count does not depend on the size of the data
+    * 'view' holds the positions of the rows shown, filtered ('filter') and
+      sorted (click on a heading) with vectorized operations on the DataFrame
+    * With 'group_by', the rows are grouped by the values of that column under
+      a header row, in order of first appearance. Clicking a header expands or
+      collapses its group, only expanded groups take display rows
+    * 'export' writes the view (all the columns) to CSV, Parquet or Arrow IPC
+      from the export worker, its progress is shown under the grid
+    * With 'editable', double-clicking a cell edits it in place. Edits are
+      written to the DataFrame and only the edited rows are filtered and
+      sorted again. 'set_cells' applies a batch of edits, Control-z undoes
+    * With 'stats', a footer shows the sum, count, min and max of each column
+      over the rows of the view (sum/min/max for numeric columns only). They
+      are computed on the arrays, edits only adjust them for the edited rows
+
+    """
+
+    def __init__(self, parent, group_by: str = None, rows: int = GRID_ROWS, editable: bool = False,
+                 stats: bool = False, *args, **kw):
+        Frame.__init__(self, parent, *args, **kw)
+        self._init_state(group_by, editable)
+        self.tree = MyTreeview(self, show='tree headings' if group_by else 'headings', height=rows,
+                               selectmode='extended')
+        self.tree.tag_configure('group', background='#e8e8e8')
+        self.scrollbar = Scrollbar(self, orient=VERTICAL, command=self.yview)
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        self.scrollbar.grid(row=0, column=1, sticky='ns')
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self._resize_pool(rows)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.tree.bind(sequence, self._on_wheel)
+        self.tree.bind('<Prior>', lambda e: self.yview('scroll', -1, 'pages'))
+        self.tree.bind('<Next>', lambda e: self.yview('scroll', 1, 'pages'))
+        self.tree.bind('<Configure>', self._on_configure)
+        self.tree.bind('<<TreeviewSelect>>', self._on_select, add='+')
+        self.tree.bind('<Button-1>', self._on_click, add='+')
+        self.status = Label(self)
+        if stats:
+            self.footer = Treeview(self, show='tree', height=len(STAT_NAMES), selectmode='none')
+            self.footer.column('#0', width=60, stretch=False)
+            for name in STAT_NAMES:
+                self.footer.insert('', END, iid=name, text=name)
+            self.footer.grid(row=1, column=0, sticky='ew')
+        self.menu = Menu(self, tearoff=0)
+        self.menu.add_command(label='Export...', command=self.ask_export)
+        self.tree.bind('<Button-3>', lambda e: self.menu.tk_popup(e.x_root, e.y_root))
+        if editable:
+            self.tree.bind('<Double-Button-1>', self._on_double_click)
+            self.tree.bind('<Control-z>', lambda e: self.undo())
+
+    def _init_state(self, group_by: Optional[str], editable: bool):
+        """Everything but the widgets, the data logic runs without Tk."""
+        self.group_by = group_by
+        self.editable = editable
+        self.data: 'pd.DataFrame' = None
+        self.columns: List[str] = []
+        self.view = None
+        self.query = ''
+        self.sort_column: Optional[str] = None
+        self.sort_reverse = False
+        self.groups: List[Tuple[Any, Any]] = []
+        self.expanded: Set[Any] = set()
+        # display rows: positions in the data, or -(group index + 1) for the group headers
+        self.display = None
+        self.offset = 0
+        self.selected: Set[int] = set()
+        # lower case text of the cells, per column, for the filter
+        self._text: Dict[str, Any] = {}
+        # batches of (position, column, previous value)
+        self.undo_log = deque(maxlen=UNDO_LIMIT)
+        self.popup: Optional[EntryPopup] = None
+        # column -> {stat name: value}, over the rows of the view
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        # Treeview items of the visible rows, and the display rows they show
+        self.pool: List[str] = []
+        self.shown: List[int] = []
+        # widget of the stats, None without
+        self.footer = None
+
+    # ---- data ----
+
+    def set_data(self, df: 'pd.DataFrame'):
+        self._load(df)
+        self.tree['columns'] = self.columns
+        for c in self.columns:
+            self.tree.column(c, anchor='w', stretch=True, width=80)
+            self.tree.heading(c, text=c, anchor='w', command=lambda c=c: self.sort(c))
+        if self.group_by is not None:
+            self.tree.heading('#0', text=self.group_by, anchor='w')
+        if self.footer is not None:
+            self.footer['columns'] = self.columns
+            for c in self.columns:
+                self.footer.column(c, anchor='w', stretch=True, width=80)
+        self.refresh()
+        self.compute_stats()
+
+    def _load(self, df: 'pd.DataFrame'):
+        self.data = df
+        self.columns = [c for c in df.columns if c != self.group_by]
+        self._text.clear()
+        self.selected.clear()
+        self.expanded.clear()
+        self.undo_log.clear()
+        self.offset = 0
+        if self.sort_column not in self.columns:
+            self.sort_column = None
+
+    def filter(self, query: str):
+        previous, self.query = self.query, query
+        self.offset = 0
+        if self.view is not None and previous and previous.lower() in query.lower():
+            # narrower query: only the rows of the view can match, and they stay sorted
+            self.view = self.view[self._matching(self.view)]
+            self._regroup()
+        else:
+            self.refresh()
+        self.compute_stats()
+
+    def sort(self, column: str):
+        self.sort_reverse = not self.sort_reverse if column == self.sort_column else False
+        self.sort_column = column
+        self.refresh()
+
+    def refresh(self):
+        """Recomputes the view (filter then sort), the groups and the display."""
+        if self.data is None:
+            return
+        self.view = self._sorted(self._filtered())
+        self._regroup()
+
+    def text(self, column: str):
+        s = self._text.get(column)
+        if s is None:
+            s = self._text[column] = self.data[column].astype(str).str.lower()
+        return s
+
+    def _filtered(self):
+        import numpy as np
+        if not self.query:
+            return np.arange(len(self.data))
+        return np.flatnonzero(self._matching())
+
+    def _matching(self, positions=None):
+        """Mask of the rows (all of them, or 'positions') matching the query."""
+        import numpy as np
+        query = self.query.lower()
+        mask = np.zeros(len(self.data) if positions is None else len(positions), dtype=bool)
+        for c in self.data.columns:
+            text = self.text(c) if positions is None else self.text(c).iloc[positions]
+            mask |= text.str.contains(query, regex=False).to_numpy()
+        return mask
+
+    def _sorted(self, view):
+        if self.sort_column is None:
+            return view
+        s = self.data[self.sort_column].iloc[view].reset_index(drop=True)
+        try:
+            order = s.sort_values(ascending=not self.sort_reverse, kind='stable', na_position='last').index
+        except TypeError:  # mixed types
+            order = self.text(self.sort_column).iloc[view].reset_index(drop=True).sort_values(
+                ascending=not self.sort_reverse, kind='stable').index
+        return view[order.to_numpy()]
+
+    def _regroup(self):
+        import numpy as np
+        import pandas as pd
+        if self.group_by is None:
+            self.groups = []
+        else:
+            codes, keys = pd.factorize(self.data[self.group_by].iloc[self.view].astype(str))
+            order = np.argsort(codes, kind='stable')
+            counts = np.bincount(codes, minlength=len(keys))
+            self.groups = list(zip(keys, np.split(self.view[order], np.cumsum(counts)[:-1])))
+        self._build_display()
+
+    def _build_display(self):
+        import numpy as np
+        if self.group_by is None:
+            self.display = self.view
+        else:
+            pieces = []
+            for g, (key, positions) in enumerate(self.groups):
+                pieces.append(np.array([-(g + 1)]))
+                if key in self.expanded:
+                    pieces.append(positions)
+            self.display = np.concatenate(pieces) if pieces else np.empty(0, dtype=np.int64)
+        self.render()
+
+    def toggle(self, key):
+        self.expanded.symmetric_difference_update({key})
+        self._build_display()
+
+    def view_data(self) -> 'pd.DataFrame':
+        """The rows shown, filtered and sorted."""
+        return self.data.iloc[self.view]
+
+    def selected_rows(self) -> 'pd.DataFrame':
+        return self.data.iloc[sorted(self.selected)]
+
+    # ---- edition ----
+
+    def edit(self, position: int, column: str, text: str):
+        """Edits one cell from its text, converted to the type of the column."""
+        try:
+            value = self._convert(column, text)
+        except ValueError as e:
+            self.status.configure(text=f'Invalid value for {column}: {e}')
+            self.status.grid(row=2, column=0, columnspan=2, sticky='w')
+            return
+        self.set_cells([(position, column, value)])
+
+    def set_cells(self, changes: Iterable[Tuple[int, str, Any]], record: bool = True):
+        """Writes the (position, column, value) to the DataFrame, one undo step for all of them."""
+        undo = []
+        columns = set()
+        for position, column, value in changes:
+            j = self.data.columns.get_loc(column)
+            undo.append((position, column, self.data.iat[position, j]))
+            self.data.iat[position, j] = value
+            text = self._text.get(column)
+            if text is not None:
+                text.iat[position] = str(value).lower()
+            columns.add(column)
+        if not undo:
+            return
+        if record:
+            self.undo_log.append(undo)
+        self._invalidate({p for p, _, _ in undo}, columns, {(p, c): old for p, c, old in reversed(undo)})
+
+    def undo(self):
+        if self.undo_log:
+            self.set_cells(reversed(self.undo_log.pop()), record=False)
+
+    def _convert(self, column: str, text: str):
+        import pandas as pd
+        kind = self.data[column].dtype.kind
+        if kind in 'iu':
+            return int(text)
+        if kind == 'f':
+            return float(text)
+        if kind == 'b':
+            return text.strip().lower() in ('1', 'true', 'yes')
+        if kind == 'M':
+            return pd.Timestamp(text)
+        return text
+
+    def _invalidate(self, positions: Set[int], columns: Set[str], previous: Dict[Tuple[int, str], Any]):
+        """Updates the view for the edited rows only: they leave or enter the
+        filter and move to their new place in the sort order."""
+        import numpy as np
+        edited = np.fromiter(sorted(positions), dtype=np.int64, count=len(positions))
+        view = self.view
+        was_shown = self._mask(view)[edited] if self.footer is not None else None
+        moved = self.sort_column in columns
+        if self.query:
+            matching = edited[self._matching(edited)]
+            moved = moved or len(matching) != len(edited) or not self._mask(view)[matching].all()
+        else:
+            matching = edited
+        if moved:
+            # before the stats, a column computed again reads the new view
+            self.view = self._place(view[~self._mask(edited)[view]], matching)
+        if self.footer is not None:
+            self._update_stats(edited, previous, was_shown, self._mask(self.view)[edited])
+        if moved or self.group_by in columns:
+            self._regroup()
+            return
+        for iid, d in zip(self.pool, self.shown):
+            if d in positions:
+                for c in columns & set(self.columns):
+                    self.tree.set(iid, c, self.data.iat[d, self.data.columns.get_loc(c)])
+
+    def _mask(self, positions):
+        """Boolean array over all the rows, True at 'positions' (cheaper than np.isin on a large view)."""
+        import numpy as np
+        mask = np.zeros(len(self.data), dtype=bool)
+        mask[positions] = True
+        return mask
+
+    def _place(self, view, positions):
+        """Inserts 'positions' in 'view', keeping it sorted."""
+        import numpy as np
+        if self.sort_column is None:
+            return np.insert(view, np.searchsorted(view, positions), positions)
+        values = self.data[self.sort_column].to_numpy()
+        keys = values[view]
+        try:
+            if keys.dtype.kind not in 'iufb' or np.isnan(keys.astype(float)).any() or \
+                    np.isnan(values[positions].astype(float)).any():
+                raise TypeError
+            if self.sort_reverse:
+                at = len(keys) - np.searchsorted(keys[::-1], values[positions], side='left')
+            else:
+                at = np.searchsorted(keys, values[positions], side='right')
+        except (TypeError, ValueError):
+            return self._sorted(np.sort(np.concatenate([view, positions])))
+        order = np.argsort(at, kind='stable')
+        return np.insert(view, at[order], positions[order])
+
+    def _on_double_click(self, event):
+        if self.popup is not None:
+            self.popup.destroy()
+            self.popup = None
+        iid = self.tree.identify_row(event.y)
+        column = self.tree.identify_column(event.x)
+        if iid not in self.pool or column == '#0':
+            return
+        i = self.pool.index(iid)
+        if i >= len(self.shown) or self.shown[i] < 0:
+            return
+        position = self.shown[i]
+        column = self.columns[int(column[1:]) - 1]
+        x, y, width, height = self.tree.bbox(iid, column)
+        self.popup = EntryPopup(self.tree, self.tree.set(iid, column),
+                                lambda text: self.edit(position, column, text))
+        self.popup.place(x=x, y=y + height // 2, anchor=W, width=width, height=height)
+        return 'break'
+
+    # ---- statistics ----
+
+    def compute_stats(self):
+        if self.footer is None or self.view is None:
+            return
+        self.stats = {c: self._column_stats(c) for c in self.columns}
+        self._show_stats()
+
+    def _column_stats(self, column: str) -> Dict[str, Any]:
+        import numpy as np
+        s = self.data[column]
+        if s.dtype.kind not in 'iufb':
+            return {'count': int(s.notna().to_numpy()[self.view].sum())}
+        values = s.to_numpy()[self.view]
+        if values.dtype.kind == 'f':
+            values = values[~np.isnan(values)]
+        stats = {'sum': values.sum(), 'count': len(values)}
+        if len(values):
+            stats['min'] = values.min()
+            stats['max'] = values.max()
+        return stats
+
+    def _update_stats(self, edited, previous: Dict[Tuple[int, str], Any], was_shown, is_shown):
+        """Removes the previous values of the edited rows which were in the view,
+        adds the new ones of those in the view now. A column is computed again
+        only when its min or max was removed."""
+        import pandas as pd
+        stale = set()
+        for c in self.columns:
+            stats = self.stats.get(c)
+            if stats is None:
+                continue
+            j = self.data.columns.get_loc(c)
+            numeric = 'sum' in stats
+            for p, was, now in zip(edited.tolist(), was_shown, is_shown):
+                value = self.data.iat[p, j]
+                old = previous.get((p, c), value)
+                if was and not pd.isna(old):
+                    stats['count'] -= 1
+                    if numeric:
+                        stats['sum'] -= old
+                        if old == stats.get('min') or old == stats.get('max'):
+                            stale.add(c)
+                if now and not pd.isna(value):
+                    stats['count'] += 1
+                    if numeric:
+                        stats['sum'] += value
+                        stats['min'] = min(stats.get('min', value), value)
+                        stats['max'] = max(stats.get('max', value), value)
+        for c in stale:
+            self.stats[c] = self._column_stats(c)
+        self._show_stats()
+
+    def _show_stats(self):
+        for name in STAT_NAMES:
+            self.footer.item(name, values=[_format_stat(self.stats.get(c, {}).get(name)) for c in self.columns])
+
+    # ---- export ----
+
+    def ask_export(self):
+        if self.view is None:
+            return
+        path = filedialog.asksaveasfilename(parent=self, defaultextension='.csv', filetypes=[
+            ('CSV', '*.csv'), ('Parquet', '*.parquet'), ('Arrow IPC', '*.arrow'), ('All files', '*')])
+        if path:
+            self.export(path)
+
+    def export(self, path: str, format: str = None):
+        from .export import ExportRequest
+        from .mini_app import ui_out_queue
+        import numpy as np
+        columns = list(self.data.columns)
+        # the rows as they are now: edits made while the export runs are not written half way
+        snapshot = self.data.iloc[self.view][columns].copy()
+        ui_out_queue.put(ExportRequest(snapshot, np.arange(len(snapshot)), columns, path, format, str(self)))
+        self.status.configure(text=f'Exporting {len(self.view)} rows to {path}')
+        self.status.grid(row=2, column=0, columnspan=2, sticky='w')
+
+    def export_progress(self, msg):
+        """To be called by the frame with the ExportProgress events it receives."""
+        if msg.target != str(self):
+            return
+        if msg.error is not None:
+            self.status.configure(text=f'Export to {msg.path} failed: {msg.error}')
+        elif msg.done:
+            self.status.configure(text=f'Exported {msg.total} rows to {msg.path}')
+            self.after(5000, self.status.grid_remove)
+        else:
+            self.status.configure(text=f'Exporting to {msg.path}: {msg.rows}/{msg.total} rows')
+
+    # ---- rendering ----
+
+    def render(self):
+        if self.display is None:
+            return
+        total = len(self.display)
+        n = len(self.pool)
+        self.offset = max(0, min(self.offset, total - n))
+        chunk = self.display[self.offset:self.offset + n]
+        rows = iter(self.data.iloc[chunk[chunk >= 0]][self.columns].values.tolist())
+        selection = []
+        for i, iid in enumerate(self.pool):
+            if i >= len(chunk):
+                self.tree.detach(iid)
+                continue
+            d = int(chunk[i])
+            if d >= 0:
+                self.tree.item(iid, text='', values=next(rows), tags=())
+                if d in self.selected:
+                    selection.append(iid)
+            else:
+                key, positions = self.groups[-d - 1]
+                mark = '-' if key in self.expanded else '+'
+                self.tree.item(iid, text=f'{mark} {key} ({len(positions)})', values=(), tags=('group',))
+            self.tree.move(iid, '', i)
+        self.shown = [int(d) for d in chunk]
+        self.tree.selection_set(selection)
+        self.scrollbar.set(*(self.offset / total, (self.offset + n) / total) if total else (0, 1))
+
+    def _resize_pool(self, n: int):
+        n = max(1, n)
+        while len(self.pool) < n:
+            iid = f'row{len(self.pool)}'
+            self.tree.insert('', END, iid=iid)
+            self.pool.append(iid)
+        while len(self.pool) > n:
+            self.tree.delete(self.pool.pop())
+        self.tree.configure(height=n)
+
+    def yview(self, *args):
+        if self.display is None:
+            return
+        if args[0] == 'moveto':
+            self.offset = int(float(args[1]) * len(self.display))
+        elif args[0] == 'scroll':
+            self.offset += int(args[1]) * (len(self.pool) if args[2] == 'pages' else 1)
+        self.render()
+
+    def _on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.yview('scroll', -3, 'units')
+        else:
+            self.yview('scroll', 3, 'units')
+        return 'break'
+
+    def _on_configure(self, event):
+        rowheight = int(Style().lookup('Treeview', 'rowheight') or 20)
+        n = max(1, (event.height - rowheight) // rowheight)
+        if n != len(self.pool):
+            self._resize_pool(n)
+            self.render()
+
+    def _on_select(self, event):
+        # idempotent, so that the selection set by 'render' changes nothing
+        selection = set(self.tree.selection())
+        shown = {d for d in self.shown if d >= 0}
+        selected = {d for iid, d in zip(self.pool, self.shown) if d >= 0 and iid in selection}
+        self.selected = (self.selected - shown) | selected
+
+    def _on_click(self, event):
+        iid = self.tree.identify_row(event.y)
+        if iid in self.pool and self.tree.identify_region(event.x, event.y) in ('tree', 'cell'):
+            i = self.pool.index(iid)
+            if i < len(self.shown) and self.shown[i] < 0:
+                self.toggle(self.groups[-self.shown[i] - 1][0])
+                return 'break'
+
+
+def _format_stat(value) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, float) or getattr(value, 'dtype', None) is not None and value.dtype.kind == 'f':
+        return f'{value:.6g}'
+    return str(value)
+
+
+class EntryPopup(Entry):
+    """Entry placed over a cell, 'on_commit' is called with its text on Return."""
+
+    def __init__(self, parent, text, on_commit: Callable[[str], Any], **kw):
+        Style().configure('pad.TEntry', padding='1 1 1 1')
+        super().__init__(parent, style='pad.TEntry', **kw)
+        self.on_commit = on_commit
+        self.insert(0, text)
+        self['exportselection'] = False
+
+        self.focus_force()
+        self.select_all()
+        self.bind("<Return>", self.on_return)
+        self.bind("<Control-a>", self.select_all)
+        self.bind("<Escape>", lambda *ignore: self.destroy())
+        self.bind("<FocusOut>", lambda *ignore: self.destroy())
+
+    def on_return(self, event):
+        text = self.get()
+        self.destroy()
+        self.on_commit(text)
+
+    def select_all(self, *ignore):
+        ''' Set selection on the whole text '''
+        self.selection_range(0, 'end')
+
+        # returns 'break' to interrupt default key-bindings
+        return 'break'
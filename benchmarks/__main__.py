@@ -0,0 +1,92 @@
+"""Benchmark suite of the side UI, headless (dummy sinks, Tk only for the
+treeview, run it under Xvfb).
+
+    python -m benchmarks [--quick] [--only dispatch,file_watch] [--json results.json] [--compare old.json]
+
+Every benchmark returns a JSON document, a benchmark that cannot run here
+(no display, missing optional dependency) is reported as skipped. The
+'--compare' option prints the ratio new/old of every common timing.
+"""
+import argparse
+import datetime as dt
+import importlib
+import json
+import logging
+import platform
+import subprocess
+import sys
+import traceback
+
+BENCHMARKS = ['startup', 'dispatch', 'file_watch', 'treeview', 'chart', 'processes']
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+def run(names, quick=False) -> dict:
+    report = {
+        'commit': _git_commit(),
+        'date': dt.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'quick': quick,
+        'results': {},
+    }
+    for name in names:
+        module = importlib.import_module(f'benchmarks.bench_{name}')
+        try:
+            report['results'][name] = module.run(quick)
+        except ImportError as e:
+            report['results'][name] = {'skipped': f'missing dependency: {e.name}'}
+        except Exception as e:
+            if type(e).__name__ == 'TclError':
+                report['results'][name] = {'skipped': f'no display: {e}'}
+            else:
+                traceback.print_exc()
+                report['results'][name] = {'error': repr(e)}
+    return report
+
+
+def _timings(d, prefix=''):
+    for k, v in d.items():
+        if isinstance(v, dict):
+            yield from _timings(v, f'{prefix}{k}.')
+        elif isinstance(v, (int, float)) and (k.endswith('_ms') or k.endswith('_per_s')):
+            yield f'{prefix}{k}', v
+
+
+def compare(new: dict, old: dict):
+    old_timings = dict(_timings(old['results']))
+    print(f"{'timing':70} {'old':>10} {'new':>10} {'new/old':>8}")
+    for k, v in _timings(new['results']):
+        if k in old_timings and old_timings[k]:
+            print(f'{k:70} {old_timings[k]:10.3f} {v:10.3f} {v / old_timings[k]:8.2f}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--quick', action='store_true', help='smaller sizes, for CI')
+    parser.add_argument('--only', help='comma separated subset of ' + ','.join(BENCHMARKS))
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument('--compare', help='results of a previous run')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    report = run(args.only.split(',') if args.only else BENCHMARKS, args.quick)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""graph plugin: time of one animate() frame vs the number of quotes. Needs matplotlib and pandas."""
+import datetime as dt
+import random
+
+from benchmarks.common import timed
+
+
+class _Holder:
+    def __init__(self, quotes):
+        self.quotes = quotes
+
+
+def run(quick: bool = False) -> dict:
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib import pyplot as plt
+    from plugins.graph import Quote, animate
+
+    sizes = [100, 1_000] if quick else [100, 1_000, 10_000, 100_000]
+    results = {}
+    now = dt.datetime.now()
+    for n in sizes:
+        quotes = [Quote(now + dt.timedelta(seconds=i), random.uniform(1, 4), random.randint(1, 50),
+                        random.choice(['bid', 'ask'])) for i in range(n)]
+        fig = plt.figure()
+
+        def frame():
+            animate(0, _Holder(quotes))
+            fig.canvas.draw()
+
+        results[f'{n}_quotes'] = timed(frame, repeat=3 if quick else 10)
+        plt.close(fig)
+    return results
@@ -0,0 +1,36 @@
+"""Event bus: dispatch throughput and round trip latency through one worker."""
+import time
+
+from app import tracer
+from benchmarks.common import BenchEvent, CountingSink, start_runtime, summarize
+
+
+def run(quick: bool = False) -> dict:
+    n = 2000 if quick else 20000
+    n_latency = 100 if quick else 1000
+    sink = CountingSink(n)
+    runtime = start_runtime([sink])
+    tracer.sink.reset()
+    try:
+        t = time.perf_counter()
+        for i in range(n):
+            runtime.submit(BenchEvent(i))
+        sink.done.wait(60)
+        elapsed = time.perf_counter() - t
+        received = sink.n
+
+        latencies = []
+        for i in range(n_latency):
+            sink.reset(1)
+            t = time.perf_counter()
+            runtime.submit(BenchEvent(i))
+            sink.done.wait(5)
+            latencies.append(time.perf_counter() - t)
+    finally:
+        runtime.stop()
+    return {
+        'throughput': {'events': n, 'received': received, 'seconds': elapsed, 'events_per_s': received / elapsed},
+        'round_trip': summarize(latencies),
+        # per stage latencies of the worker, from the tracer
+        'spans': {k: v for k, v in tracer.sink.snapshot()['histograms'].items() if k.startswith('BenchEvent/')},
+    }
@@ -0,0 +1,76 @@
+"""FileSubscriber: cost of one poll and change detection latency vs file size."""
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from typing import Type
+
+from app import FileSubscriber
+from app.mini_app import FileUpdateEvent
+from benchmarks.common import CountingSink, summarize, stop_loop
+
+KB = 1024
+
+
+class _FileSubscriber(FileSubscriber):
+    # not registered: no WorkerMeta
+    def __init__(self, out_queues, file_name):
+        super().__init__(out_queues)
+        self.file_name = file_name
+
+    def get_type(self) -> Type[FileUpdateEvent]:
+        return FileUpdateEvent
+
+    def get_file_name(self) -> str:
+        return self.file_name
+
+
+def _write(path, size, marker):
+    line = (marker * 79)[:79] + '\n'
+    with open(path, 'w') as f:
+        f.write(line * max(1, size // len(line)))
+
+
+def _bench_size(directory, size, repeat) -> dict:
+    path = os.path.join(directory, f'watch_{size}.txt')
+    _write(path, size, 'a')
+    sink = CountingSink(1)
+    sub = _FileSubscriber([sink], path)
+
+    loop = asyncio.new_event_loop()
+    poll = []
+    for i in range(repeat * 5):
+        sub.state = None
+        t = time.perf_counter()
+        loop.run_until_complete(sub._get_update())
+        poll.append(time.perf_counter() - t)
+
+    loop.create_task(sub.start())
+    t = threading.Thread(target=loop.run_forever)
+    t.daemon = True
+    t.start()
+    sink.done.wait(5)  # initial content
+
+    # idle: the subscriber backs off between polls
+    detection = []
+    # woken as on a save in the editor
+    woken = []
+    for i in range(repeat * 2):
+        sink.reset(1)
+        t0 = time.perf_counter()
+        _write(path, size, 'b' if i % 2 == 0 else 'a')
+        if i % 2:
+            sub.wake()
+        sink.done.wait(10)
+        (woken if i % 2 else detection).append(time.perf_counter() - t0)
+    stop_loop(loop, t)
+    return {'bytes': os.path.getsize(path), 'poll': summarize(poll), 'detection': summarize(detection),
+            'detection_woken': summarize(woken)}
+
+
+def run(quick: bool = False) -> dict:
+    sizes = [KB, 100 * KB, 1024 * KB] if quick else [KB, 100 * KB, 1024 * KB, 10 * 1024 * KB]
+    repeat = 2 if quick else 5
+    with tempfile.TemporaryDirectory() as directory:
+        return {f'{size // KB}KB': _bench_size(directory, size, repeat) for size in sizes}
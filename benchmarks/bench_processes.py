@@ -0,0 +1,89 @@
+"""Worker processes: frame times of a simulated UI loop while a CPU bound worker
+is flooded, first in the UI process (competing for the GIL) then in a child process."""
+import os
+import time
+from typing import Any, List, Type
+
+from app import Event, Worker, WorkerMeta, metaclass_resolver, register_codec, registry, PluginSpec, Runtime
+from app.mini_app import TracedQueue
+from benchmarks.common import CountingSink, summarize
+
+BUSY_MS = 2
+FRAME_PERIOD = 0.01
+# pure python work of one simulated frame, about 0.5 ms
+FRAME_WORK = 20000
+
+
+class BusyEvent(Event):
+    __slots__ = ('n',)
+
+    def __init__(self, n: int):
+        self.n = n
+
+    @staticmethod
+    def get_repr():
+        return 'BUSY'
+
+
+register_codec(BusyEvent, [('n', 'i')])
+
+
+class BusyWorker(metaclass_resolver(Worker, WorkerMeta)):
+    def get_type(self) -> Type[Event]:
+        return BusyEvent
+
+    async def _process_message(self, message) -> Any:
+        end = time.perf_counter() + BUSY_MS / 1000
+        while time.perf_counter() < end:
+            pass
+        return message
+
+
+def _frames(duration: float) -> List[float]:
+    """Time from the scheduled start of every frame to its end."""
+    frames = []
+    tick = time.perf_counter()
+    end = tick + duration
+    while tick < end:
+        sum(range(FRAME_WORK))
+        frames.append(time.perf_counter() - tick)
+        tick += FRAME_PERIOD
+        time.sleep(max(0.0, tick - time.perf_counter()))
+    return frames
+
+
+def _loaded(duration: float, process: bool) -> dict:
+    if process:
+        registry.plugins[__name__] = PluginSpec(__name__, frame=None, process='bench')
+    sink = CountingSink(1 << 62)
+    runtime = Runtime([sink], source=TracedQueue())
+    runtime.start()
+    try:
+        deadline = time.perf_counter() + 30
+        while not runtime.workers_by_type.get('BUSY'):
+            if time.perf_counter() > deadline:
+                raise RuntimeError('no worker for BUSY started')
+            time.sleep(0.01)
+        # enough work for the whole measure
+        for i in range(int(duration * 1000 / BUSY_MS * 1.5)):
+            runtime.submit(BusyEvent(i))
+        time.sleep(0.1)
+        start = sink.n
+        frames = _frames(duration)
+        processed = sink.n - start
+    finally:
+        runtime.stop()
+        registry.plugins.pop(__name__, None)
+    return {'frames': summarize(frames), 'events_per_s': processed / duration}
+
+
+def run(quick: bool = False) -> dict:
+    duration = 1 if quick else 3
+    return {
+        'cpus': os.cpu_count(),
+        'busy_ms': BUSY_MS,
+        'idle': {'frames': summarize(_frames(duration))},
+        'in_process': _loaded(duration, process=False),
+        'worker_process': _loaded(duration, process=True),
+    }
+
@@ -0,0 +1,114 @@
+"""Startup time of the side UI.
+
+    python -m benchmarks.bench_startup [--eager] [--runs N]
+
+Prints a JSON document with
+* the import time breakdown of 'app' and of every plugin of the manifest
+  (from 'python -X importtime', in milliseconds, cumulative)
+* the time to the first painted window, from interpreter start to the first
+  idle loop after the window is mapped
+
+'--eager' imports every plugin and builds every frame up front, which is
+what the UI did before frames were built lazily.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_PAINT = '''
+import time
+t0 = time.perf_counter()
+import json, sys
+from app import mini_app, registry
+registry.discover()
+registry.load(autostart_only=True)
+r = mini_app.App()
+m = mini_app.Main(r)
+m.pack(side='top', fill='both', expand=True)
+if {eager}:
+    for name in list(m.frame_factories):
+        m.build_frame(name)
+t_built = time.perf_counter()
+r.wait_visibility()
+r.update_idletasks()
+r.update()
+t1 = time.perf_counter()
+print(json.dumps({{'build_ms': (t_built - t0) * 1000, 'first_paint_ms': (t1 - t0) * 1000}}))
+r.destroy()
+'''
+
+
+def _run(code: str, *args) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args, '-c', code], cwd=ROOT, capture_output=True, text=True)
+
+
+def _top_level_import_times(code: str) -> Dict[str, float]:
+    p = _run(code, '-X', 'importtime')
+    if p.returncode != 0:
+        raise RuntimeError(p.stderr.strip().splitlines()[-1])
+    times = {}
+    for line in p.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue
+        name = name.rstrip()
+        # only keep top level imports, nested ones are part of them
+        if len(name) - len(name.lstrip()) <= 1:
+            times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def import_times(module: str, preload: str = 'pass') -> Dict[str, float]:
+    """Cumulative import time (ms) of 'module' and of the other top level imports
+    it triggers, not counting what 'preload' (or the interpreter) already imported."""
+    try:
+        before = _top_level_import_times(preload)
+        after = _top_level_import_times(f'{preload}\nimport {module}')
+    except RuntimeError as e:
+        return {'error': str(e)}
+    times = {k: v for k, v in after.items() if k not in before}
+    return dict(sorted(times.items(), key=lambda kv: kv[1], reverse=True))
+
+
+def first_paint(eager: bool, runs: int) -> Dict[str, float]:
+    results: List[Dict[str, float]] = []
+    for _ in range(runs):
+        p = _run(FIRST_PAINT.format(eager=eager))
+        if p.returncode != 0:
+            return {'error': p.stderr.strip().splitlines()[-1]}
+        results.append(json.loads(p.stdout.strip().splitlines()[-1]))
+    return {k: statistics.median(r[k] for r in results) for k in results[0]}
+
+
+def run(quick: bool = False, eager: bool = False, runs: int = 5) -> dict:
+    sys.path.insert(0, ROOT)
+    from app.manifest import load_manifest
+
+    report = {
+        'eager': eager,
+        'imports': {'app': import_times('app')},
+        'first_window': first_paint(eager, 1 if quick else runs),
+    }
+    for spec in load_manifest(os.path.join(ROOT, 'plugins', 'manifest.json')):
+        report['imports'][spec.module] = import_times(spec.module, preload='import app')
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--eager', action='store_true')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(eager=args.eager, runs=args.runs), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""DataGrid (tree_view plugin): load, sort, filter and edit at 10k to 1M rows. Needs Tk (Xvfb) and pandas."""
+import time
+from tkinter import Tk
+from tkinter.ttk import Frame
+
+from benchmarks.common import timed
+
+
+def _frame():
+    from plugins.tree_view import F
+    root = Tk()
+    root.withdraw()
+    m = Frame(root)
+    return root, F(m, m)
+
+
+def run(quick: bool = False) -> dict:
+    import numpy as np
+    import pandas as pd
+
+    sizes = [10_000] if quick else [10_000, 100_000, 1_000_000]
+    root, frame = _frame()
+    results = {}
+    try:
+        for n in sizes:
+            df = pd.DataFrame({
+                'a': np.random.randint(0, 1_000_000, n),
+                'b': np.random.choice(['x', 'y', 'z'], n),
+                'c': np.arange(n),
+            })
+            for child in frame.winfo_children():
+                child.destroy()
+            t = time.perf_counter()
+            grid = frame.create_treeview(df)
+            root.update_idletasks()
+            load = time.perf_counter() - t
+            sort = timed(grid.sort, 'a')
+            positions = iter(np.random.randint(0, n, 100).tolist())
+
+            def _edit():
+                grid.edit(next(positions), 'a', '123')
+
+            results[f'{n}_rows'] = {
+                'load_ms': load * 1000,
+                'sort': sort,
+                'filter': timed(grid.filter, '99'),
+                # sorted and filtered, only the edited row is placed again
+                'edit': timed(_edit, repeat=50),
+                'unfilter': timed(grid.filter, ''),
+            }
+    finally:
+        root.destroy()
+    return results
@@ -0,0 +1,94 @@
+import asyncio
+import statistics
+import threading
+import time
+from typing import List, Dict, Any, Type
+
+from app import Event, Worker, WorkerMeta, metaclass_resolver, Runtime, register_codec
+from app.mini_app import TracedQueue
+
+
+class BenchEvent(Event):
+    __slots__ = ('n',)
+
+    def __init__(self, n: int):
+        self.n = n
+
+    @staticmethod
+    def get_repr():
+        return 'BENCH'
+
+
+register_codec(BenchEvent, [('n', 'i')])
+
+
+class EchoWorker(metaclass_resolver(Worker, WorkerMeta)):
+    def get_type(self) -> Type[Event]:
+        return BenchEvent
+
+    async def _process_message(self, message) -> Any:
+        return message
+
+
+class CountingSink:
+    """Counts the results, 'done' is set once 'expected' of them arrived."""
+
+    def __init__(self, expected: int = 0):
+        self.n = 0
+        self.expected = expected
+        self.done = threading.Event()
+
+    def reset(self, expected: int):
+        self.n = 0
+        self.expected = expected
+        self.done.clear()
+
+    def put(self, result):
+        if result is None:
+            return
+        self.n += 1
+        if self.n >= self.expected:
+            self.done.set()
+
+
+def start_runtime(sinks: List, repr_: str = 'BENCH', timeout: float = 5) -> Runtime:
+    r = Runtime(sinks, source=TracedQueue())
+    r.start()
+    deadline = time.perf_counter() + timeout
+    while repr_ not in r.workers_by_type or r.workers_by_type[repr_][0].in_queue is None:
+        if time.perf_counter() > deadline:
+            raise RuntimeError(f'no worker for {repr_} started')
+        time.sleep(0.01)
+    return r
+
+
+def summarize(seconds: List[float]) -> Dict[str, float]:
+    ms = sorted(s * 1000 for s in seconds)
+    return {
+        'n': len(ms),
+        'mean_ms': statistics.fmean(ms),
+        'p50_ms': ms[len(ms) // 2],
+        'p90_ms': ms[int(len(ms) * 0.9)],
+        'p99_ms': ms[min(len(ms) - 1, int(len(ms) * 0.99))],
+        'max_ms': ms[-1],
+    }
+
+
+def timed(f, *args, repeat: int = 1, **kwargs) -> Dict[str, float]:
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        f(*args, **kwargs)
+        times.append(time.perf_counter() - t)
+    return summarize(times)
+
+
+def stop_loop(loop: asyncio.AbstractEventLoop, thread: threading.Thread):
+    """Stop a loop running in 'thread' and cancel what is left on it."""
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    tasks = asyncio.all_tasks(loop)
+    for task in tasks:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+    loop.close()
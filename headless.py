@@ -0,0 +1,32 @@
+"""Run the worker layer without Tk (servers, load tests, profiling).
+
+    python headless.py [--sink print|null] [--plugins plugins.done,plugins.clipboard] [--duration SECONDS]
+"""
+import argparse
+import logging
+import time
+
+from app import run_headless, NullSink, PrintSink
+
+SINKS = {
+    'print': PrintSink,
+    'null': NullSink,
+}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sink', choices=list(SINKS), default='print')
+    parser.add_argument('--plugins', help='comma separated plugin modules, all the enabled ones by default')
+    parser.add_argument('--duration', type=float, help='stop after this many seconds')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    runtime = run_headless([SINKS[args.sink]()], args.plugins.split(',') if args.plugins else None)
+    try:
+        if args.duration is None:
+            while True:
+                time.sleep(3600)
+        time.sleep(args.duration)
+    except KeyboardInterrupt:
+        pass
+    runtime.stop()
@@ -1,28 +1,219 @@
 import os
+import sqlite3
+import time
 from queue import Queue
+from threading import Lock
+from tkinter import *
+from tkinter.ttk import *
 from typing import *
 
 from app import *
 
 CLIPBOARD_FILE = r'clipboard.txt'
+CLIPBOARD_DB = r'clipboard.db'
+# retention, None for no limit
+CLIPBOARD_MAX_CLIPS = 10000
+CLIPBOARD_MAX_DAYS = None
+SEARCH_LIMIT = 200
+SEARCH_DELAY = 150
+PRUNE_EVERY = 100
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS clips (
+    id INTEGER PRIMARY KEY,
+    hash BLOB NOT NULL UNIQUE,
+    content TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    count INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS clips_last_used ON clips (last_used);
+'''
+
+FTS_SCHEMA = '''
+CREATE VIRTUAL TABLE IF NOT EXISTS clips_fts USING fts5(content, content='clips', content_rowid='id', prefix='2 3');
+CREATE TRIGGER IF NOT EXISTS clips_ai AFTER INSERT ON clips BEGIN
+    INSERT INTO clips_fts (rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS clips_ad AFTER DELETE ON clips BEGIN
+    INSERT INTO clips_fts (clips_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+'''
+
+
+class ClipHistory:
+    """Clipboard history in SQLite.
+    * a clip is stored once, keyed by the hash of its content, copying it
+      again only moves it to the top
+    * searched through an FTS5 index (every word as a prefix), or LIKE when
+      the sqlite build has no FTS5
+    * retention: the 'max_clips' most recent clips, younger than 'max_days'
+    * shared by the worker (asyncio thread) and the frame (Tk thread)
+
+    """
+
+    def __init__(self, path: str = CLIPBOARD_DB, max_clips: Optional[int] = CLIPBOARD_MAX_CLIPS,
+                 max_days: Optional[float] = CLIPBOARD_MAX_DAYS):
+        self.max_clips = max_clips
+        self.max_days = max_days
+        self.lock = Lock()
+        self.added = 0
+        new = not os.path.exists(path)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.executescript(SCHEMA)
+        try:
+            self.db.executescript(FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False
+        if new and os.path.exists(CLIPBOARD_FILE):
+            self._import_file(CLIPBOARD_FILE)
+
+    def _import_file(self, path: str):
+        """One off import of the old newline separated history (multi line clips are split)."""
+        with open(path, 'r', errors='replace') as f:
+            for line in f:
+                if line.strip():
+                    self.add(line.rstrip('\n'))
+
+    def add(self, content: str) -> bool:
+        """Returns True when the clip was not in the history yet."""
+        h = digest(content.encode('utf-8', 'surrogatepass'))
+        now = time.time()
+        with self.lock, self.db:
+            updated = self.db.execute('UPDATE clips SET last_used = ?, count = count + 1 WHERE hash = ?',
+                                      (now, h)).rowcount
+            if not updated:
+                self.db.execute('INSERT INTO clips (hash, content, created, last_used) VALUES (?, ?, ?, ?)',
+                                (h, content, now, now))
+                self.added += 1
+        if self.added >= PRUNE_EVERY:
+            self.prune()
+        return not updated
+
+    def prune(self):
+        with self.lock, self.db:
+            self.added = 0
+            if self.max_days is not None:
+                self.db.execute('DELETE FROM clips WHERE last_used < ?', (time.time() - self.max_days * 86400,))
+            if self.max_clips is not None:
+                self.db.execute('DELETE FROM clips WHERE id NOT IN '
+                                '(SELECT id FROM clips ORDER BY last_used DESC LIMIT ?)', (self.max_clips,))
+
+    def search(self, query: str, limit: int = SEARCH_LIMIT) -> List[Tuple[int, str]]:
+        """Most recently used clips matching every word of 'query' (as prefixes)."""
+        words = query.split()
+        with self.lock:
+            if not words:
+                return self.db.execute('SELECT id, content FROM clips ORDER BY last_used DESC LIMIT ?',
+                                       (limit,)).fetchall()
+            if self.fts:
+                match = ' '.join('"{}"*'.format(w.replace('"', '""')) for w in words)
+                return self.db.execute('SELECT c.id, c.content FROM clips_fts JOIN clips c ON c.id = clips_fts.rowid '
+                                       'WHERE clips_fts MATCH ? ORDER BY c.last_used DESC LIMIT ?',
+                                       (match, limit)).fetchall()
+            where = ' AND '.join(['content LIKE ?'] * len(words))
+            return self.db.execute(f'SELECT id, content FROM clips WHERE {where} ORDER BY last_used DESC LIMIT ?',
+                                   [f'%{w}%' for w in words] + [limit]).fetchall()
+
+    def get(self, clip_id: int) -> Optional[str]:
+        with self.lock:
+            row = self.db.execute('SELECT content FROM clips WHERE id = ?', (clip_id,)).fetchone()
+        return row[0] if row else None
+
+
+class ClipTouched(Event):
+    """A clip already in the history was copied again: it moved to the top.
+    Only the clipboard frame cares, the content is not sent again."""
+    __slots__ = ()
+
+    @staticmethod
+    def get_repr():
+        return 'ClipTouched'
+
+
+register_codec(ClipTouched, [])
+
+_history: Optional[ClipHistory] = None
+
+
+def get_history() -> ClipHistory:
+    global _history
+    if _history is None:
+        _history = ClipHistory()
+    return _history
 
 
 class ClipboardListener(metaclass_resolver(Worker, WorkerMeta)):
     def __init__(self, out_queues: List[Queue]):
         super().__init__(out_queues)
-        self.state = None
-
-    async def start(self):
-        if not os.path.exists(CLIPBOARD_FILE):
-            open(CLIPBOARD_FILE, 'w').close()
-        return await super().start()
+        self.history = get_history()
 
     def get_type(self) -> Type[Event]:
         return NewClipboardInfo
 
     async def _process_message(self, message) -> Any:
-        if self.state != message.clipboard:
-            self.state = message.clipboard
-            with open(CLIPBOARD_FILE, 'a') as f:
-                f.write(message.clipboard + '\n')
+        # a clip already in the history is not published again, only its move
+        if self.history.add(message.clipboard):
             return message
+        return ClipTouched()
+
+
+class F(MyFrame):
+    def __init__(self, parent, controller):
+        Frame.__init__(self, parent)
+        self.parent = parent
+        self.controller = controller
+        self.history = get_history()
+        self.query = StringVar(master=self)
+        self.query.trace_add('write', lambda *args: self.schedule_search())
+        self.pending = None
+        self.ids: List[int] = []
+        Entry(self, textvariable=self.query).pack(fill='x')
+        self.clips = Listbox(self, activestyle='none')
+        self.clips.pack(expand=True, fill='both')
+        self.clips.bind('<Double-Button-1>', self.copy)
+        self.clips.bind('<Return>', self.copy)
+        self.search()
+
+    def get_types(self) -> List[Type[Event]]:
+        return [NewClipboardInfo, ClipTouched]
+
+    def process(self, message: Event):
+        self.schedule_search()
+
+    @staticmethod
+    def get_name():
+        return 'Clipboard'
+
+    def schedule_search(self):
+        if self.pending is not None:
+            self.after_cancel(self.pending)
+        self.pending = self.after(SEARCH_DELAY, self.search)
+
+    def search(self):
+        self.pending = None
+        rows = self.history.search(self.query.get())
+        self.ids = [clip_id for clip_id, _ in rows]
+        self.clips.delete(0, 'end')
+        for _, content in rows:
+            first = content.strip().split('\n', 1)[0]
+            self.clips.insert('end', first[:80] + ('...' if len(first) > 80 or '\n' in content.strip() else ''))
+
+    def copy(self, event=None):
+        selection = self.clips.curselection()
+        if not selection:
+            return
+        content = self.history.get(self.ids[selection[0]])
+        if content is not None:
+            self.clipboard_clear()
+            self.clipboard_append(content)
+
+
+if __name__ == '__main__':
+    root = Tk()
+    m = Frame(root)
+    m.pack()
+    F(m, m).pack()
+    root.mainloop()
@@ -0,0 +1,90 @@
+import time
+from queue import Queue
+from tkinter import *
+from tkinter.ttk import *
+from typing import List, Type
+
+from app import *
+
+REFRESH_RATE = 1000
+COLUMNS = ['depth', 'msg/s', 'p50_ms', 'p99_ms']
+
+
+class F(MyFrame):
+    def __init__(self, parent, controller):
+        Frame.__init__(self, parent)
+        self.parent = parent
+        self.controller = controller
+        self.tree = Treeview(self, columns=COLUMNS)
+        self.tree.heading('#0', text='queue/worker', anchor='w')
+        self.tree.column('#0', width=110)
+        for c in COLUMNS:
+            self.tree.heading(c, text=c, anchor='e')
+            self.tree.column(c, width=45, anchor='e')
+        self.tree.pack(expand=True, fill='both')
+        self.last_time = time.perf_counter()
+        self.last_processed = {}
+        self.refresh()
+
+    def get_types(self) -> List[Type[Event]]:
+        return []
+
+    def process(self, message: Event):
+        pass
+
+    @staticmethod
+    def get_name():
+        return 'Diagnostics'
+
+    def _set(self, key, values, text=None):
+        if self.tree.exists(key):
+            self.tree.item(key, values=values)
+        else:
+            self.tree.insert('', END, iid=key, text=key if text is None else text, values=values)
+
+    def refresh(self):
+        # nothing to do while another frame is shown
+        if self.controller.frames.get(self.controller.current) is self:
+            self._refresh()
+        self.after(REFRESH_RATE, self.refresh)
+
+    def _refresh(self):
+        now = time.perf_counter()
+        elapsed = now - self.last_time
+        self.last_time = now
+        dispatcher_queue = runtime.dispatcher_queue
+        # percentiles over the last refresh period (the lag is recorded on the Tk thread too)
+        lag, self.controller.loop_lag = self.controller.loop_lag, Histogram()
+        self._set('ui_out_queue', [ui_out_queue.qsize(), '', '', ''])
+        self._set('dispatcher', [dispatcher_queue.qsize() if dispatcher_queue is not None else '', '', '', ''])
+        self._set('Tk queue', [self.controller.master.queue.qsize(), '', '', ''])
+        self._set('Tk loop lag', ['', '', '{:.1f}'.format(lag.percentile(50)), '{:.1f}'.format(lag.percentile(99))])
+        for w in list(runtime.workers):
+            # one row per worker, several may handle the same event type
+            rate = (w.processed - self.last_processed.get(w, w.processed)) / elapsed
+            self.last_processed[w] = w.processed
+            durations = w.take_durations()
+            self._set(str(id(w)), [w.in_queue.qsize() if w.in_queue is not None else '', '{:.1f}'.format(rate),
+                                   '{:.2f}'.format(durations.percentile(50)),
+                                   '{:.2f}'.format(durations.percentile(99))],
+                      '{} ({})'.format(type(w).__name__, w.get_type().get_repr()))
+
+
+class DemoController:
+    """What the frame reads of Main, for the demo below."""
+
+    def __init__(self, master):
+        self.master = master
+        self.master.queue = Queue()
+        self.frames = {}
+        self.current = F.get_name()
+        self.loop_lag = Histogram()
+
+
+if __name__ == '__main__':
+    root = Tk()
+    controller = DemoController(root)
+    f = controller.frames[controller.current] = F(root, controller)
+    f.pack(expand=True, fill='both')
+    runtime.start()
+    root.mainloop()
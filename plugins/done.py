@@ -4,16 +4,17 @@ from tkinter import *
 from tkinter.ttk import *
 from typing import *
 
-import pandas as pd
-from pandas.errors import EmptyDataError
-
 from app import *
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 DONE_FILE = r'done.txt'
 
 
 class DoneFileUpdate(Event):
-    update: pd.DataFrame
+    __slots__ = ('update', 'new_update')
+    update: 'pd.DataFrame'
     new_update: Tuple[str, str]
 
     def __init__(self, update, new_update) -> None:
@@ -44,10 +45,14 @@ class DoneFileSubscriber(metaclass_resolver(FileSubscriber, WorkerMeta)):
                 d = message.new_update[0]
                 t = message.new_update[1]
                 f.write("{},{}\n".format(d, t))
+            # the table shows the new line now, not at the next period
+            self.wake()
             return
         return message
 
     async def _get_update(self) -> Any:
+        import pandas as pd
+        from pandas.errors import EmptyDataError
         try:
             df = pd.read_csv(self.get_file_name())
         except EmptyDataError:
@@ -75,6 +80,8 @@ class F(MyFrame):
         Button(self, text="Open file", command=lambda: open_file(DONE_FILE)).pack()
         self.container = VerticalScrolledFrame(self)
         self.container.pack(expand=True, fill='x')
+        self.dones = KeyedList(self.container.interior)
+        self.dones.pack(fill='x')
 
     def get_types(self) -> List[Type[Event]]:
         return [DoneFileUpdate]
@@ -87,10 +94,7 @@ class F(MyFrame):
         return 'Done'
 
     def update_dones(self, message: DoneFileUpdate):
-        for item in self.container.interior.winfo_children():
-            item.destroy()
-        for update in message.update['task'].values:
-            Label(self.container.interior, text=update.strip()).pack()
+        self.dones.set_items(update.strip() for update in message.update['task'].values)
 
     def _update(self):
         now = dt.date.today().strftime('%Y-%m-%d')
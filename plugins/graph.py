@@ -3,27 +3,15 @@ from tkinter import *
 from tkinter.ttk import *
 from typing import *
 
-import matplotlib
-import pandas as pd
-
 from app import *
 
-matplotlib.use('TkAgg')
-import matplotlib.animation as animation
-import matplotlib.ticker as mticker
-import matplotlib.dates as mdates
-from matplotlib import pyplot as plt
-from matplotlib import style
-from matplotlib.backends.backend_tkagg import (FigureCanvasTkAgg, NavigationToolbar2Tk)
-import numpy as np
-
-style.use('ggplot')
-
 REFRESH_RATE = 1000
 DAT_COUNTER = 9000
 
 
 class Quote(Event):
+    __slots__ = ('timestamp', 'price', 'quantity', 'way')
+
     def __init__(self, timestamp: dt.datetime, price: float, quantity: float, way: str):
         self.timestamp = timestamp
         self.price = price
@@ -44,6 +32,9 @@ class Quote(Event):
         }
 
 
+register_codec(Quote, [('timestamp', 't'), ('price', 'f'), ('quantity', 'f'), ('way', 's')])
+
+
 class W(metaclass_resolver(Worker, WorkerMeta)):
     def get_type(self) -> Type[Event]:
         return Quote
@@ -52,8 +43,20 @@ class W(metaclass_resolver(Worker, WorkerMeta)):
         return message
 
 
+def _use_tk_backend():
+    # matplotlib is only imported once the graph is shown
+    import matplotlib
+    matplotlib.use('TkAgg')
+    from matplotlib import style
+    style.use('ggplot')
+
+
 class F(MyFrame):
     def __init__(self, parent, controller):
+        _use_tk_backend()
+        import matplotlib.animation as animation
+        from matplotlib import pyplot as plt
+        from matplotlib.backends.backend_tkagg import (FigureCanvasTkAgg, NavigationToolbar2Tk)
         Frame.__init__(self, parent)
         self.parent = parent
         self.controller = controller
@@ -87,9 +90,14 @@ class F(MyFrame):
 
 
 def animate(frame, *fargs):
+    import matplotlib.ticker as mticker
+    import matplotlib.dates as mdates
+    from matplotlib import pyplot as plt
+    import numpy as np
+    import pandas as pd
     try:
         obj = fargs[0]
-        data = pd.DataFrame([i.__dict__ for i in obj.quotes], columns=['timestamp', 'price', 'quantity', 'way'])
+        data = pd.DataFrame({f: [getattr(q, f) for q in obj.quotes] for f in Quote.__slots__})
         a = plt.subplot2grid((6, 4), (0, 0), rowspan=5, colspan=4)
         a2 = plt.subplot2grid((6, 4), (5, 0), rowspan=1, colspan=4, sharex=a)
         data["datestamp"] = np.array(data['timestamp']).astype('datetime64[s]')
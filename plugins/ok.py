@@ -6,6 +6,8 @@ from app import *
 
 
 class E(Event):
+    __slots__ = ('m',)
+
     def __init__(self, m: str):
         self.m = m
 
@@ -14,6 +16,9 @@ class E(Event):
         return 'E'
 
 
+register_codec(E, [('m', 's')])
+
+
 class W(metaclass_resolver(Worker, WorkerMeta)):
     def get_type(self) -> Type[Event]:
         return E
@@ -29,16 +34,14 @@ class F(MyFrame):
         self.controller = controller
         Label(self, text='Main content').pack()
         Button(self, text="Send", command=lambda: ui_out_queue.put(E("ok"))).pack()
-        self.container = VerticalScrolledFrame(self)
+        self.container = LogView(self)
         self.container.pack(expand=True, fill='both')
 
     def get_types(self) -> List[Type[Event]]:
         return [E]
 
     def process(self, message: E):
-        Label(self.container.interior, text=message.m).pack()
-        self.container.canvas.update_idletasks()
-        self.container.canvas.yview_moveto(1)
+        self.container.append(message.m)
 
     @staticmethod
     def get_name():
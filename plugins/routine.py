@@ -1,18 +1,104 @@
+import csv
 import datetime as dt
 import os
+import sqlite3
+from threading import Lock
 from tkinter import *
 from tkinter.ttk import *
-from typing import List, Type, Any
-
-import pandas as pd
+from typing import List, Type, Any, Optional, Set, Tuple
 
 from app import *
 
 ROUTINE_FILE = r'routine.txt'
 ROUTINE_CHECK = r'routine_check.txt'
+ROUTINE_DB = r'routine.db'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS checks (
+    date TEXT NOT NULL,
+    item TEXT NOT NULL,
+    PRIMARY KEY (date, item)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS checks_item ON checks (item, date);
+'''
+
+
+class RoutineStore:
+    """Routine checks in SQLite, one row per (date, item).
+    * today's checks are cached, 'done_today' is a set lookup and only
+      queries again when the date changes
+    * 'streak' and 'history' read the (item, date) and date indexes, the
+      cost does not grow with the whole history
+    * the old routine_check.txt csv is imported once, when the database is created
+
+    """
+
+    def __init__(self, path: str = ROUTINE_DB):
+        self.lock = Lock()
+        new = not os.path.exists(path)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        if new and os.path.exists(ROUTINE_CHECK):
+            self._import_file(ROUTINE_CHECK)
+        self.today: Optional[str] = None
+        self.today_done: Set[str] = set()
+
+    def _import_file(self, path: str):
+        with open(path, 'r', newline='') as f, self.lock, self.db:
+            self.db.executemany('INSERT OR IGNORE INTO checks (date, item) VALUES (?, ?)',
+                                ((row['date'], row['item']) for row in csv.DictReader(f)))
+
+    def done_today(self) -> Set[str]:
+        today = str(dt.date.today())
+        if today != self.today:
+            with self.lock:
+                rows = self.db.execute('SELECT item FROM checks WHERE date = ?', (today,)).fetchall()
+            self.today, self.today_done = today, {item for item, in rows}
+        return self.today_done
+
+    def check(self, item: str, date: dt.date = None):
+        date = str(date or dt.date.today())
+        with self.lock, self.db:
+            self.db.execute('INSERT OR IGNORE INTO checks (date, item) VALUES (?, ?)', (date, item))
+        if date == self.today:
+            self.today_done.add(item)
+
+    def streak(self, item: str) -> int:
+        """Consecutive days 'item' was checked, up to today (or yesterday when not done yet today)."""
+        day = dt.date.today()
+        with self.lock:
+            dates = self.db.execute('SELECT date FROM checks WHERE item = ? AND date <= ? ORDER BY date DESC',
+                                    (item, str(day)))
+            n = 0
+            for date, in dates:
+                if date != str(day):
+                    if n == 0 and date == str(day - dt.timedelta(days=1)):
+                        day -= dt.timedelta(days=1)
+                    else:
+                        break
+                n += 1
+                day -= dt.timedelta(days=1)
+        return n
+
+    def history(self, days: int = 30) -> List[Tuple[str, str]]:
+        since = str(dt.date.today() - dt.timedelta(days=days))
+        with self.lock:
+            return self.db.execute('SELECT date, item FROM checks WHERE date > ? ORDER BY date', (since,)).fetchall()
+
+
+_store: Optional[RoutineStore] = None
+
+
+def get_store() -> RoutineStore:
+    global _store
+    if _store is None:
+        _store = RoutineStore()
+    return _store
 
 
 class E(Event):
+    __slots__ = ('m',)
+
     def __init__(self, m: str):
         self.m = m
 
@@ -21,17 +107,15 @@ class E(Event):
         return 'ROUTINE CHECK'
 
 
+register_codec(E, [('m', 's')])
+
+
 class W(metaclass_resolver(Worker, WorkerMeta)):
     def get_type(self) -> Type[Event]:
         return E
 
     async def _process_message(self, message: E) -> Any:
-        if not os.path.exists(ROUTINE_CHECK):
-            with open(ROUTINE_CHECK, 'w') as f:
-                f.write("date,item\n")
-        with open(ROUTINE_CHECK, 'a') as f:
-            now = dt.date.today()
-            f.write(f"{now},{message.m}\n")
+        get_store().check(message.m)
         return message
 
 
@@ -60,12 +144,8 @@ class F(MyFrame):
         button_by_name = {}
         if not os.path.exists(ROUTINE_FILE):
             return
-        already_done = set()
-        if os.path.exists(ROUTINE_CHECK):
-            df = pd.read_csv(ROUTINE_CHECK)
-            now = dt.date.today()
-            df = df[df['date'].isin([str(now)])]
-            already_done = set(df['item'].values)
+        store = get_store()
+        already_done = store.done_today()
         with open(ROUTINE_FILE, 'r') as f:
             for line in f:
                 if line == '\n':
@@ -86,7 +166,8 @@ class F(MyFrame):
 
                         return inner
 
-                    b = Button(frame, text=l, command=out(button_by_name))
+                    streak = store.streak(l)
+                    b = Button(frame, text=f'{l} ({streak})' if streak else l, command=out(button_by_name))
                     button_by_name[l] = b
                     b.pack(expand=True, fill='both')
         frame.pack(expand=True, fill='both')
@@ -1,3 +1,6 @@
+import codecs
+import json
+import mmap
 import os
 from tkinter import *
 from tkinter.ttk import *
@@ -6,9 +9,35 @@ from typing import List, Type
 from app import *
 
 FILE = r'text.txt'
+JOURNAL_FILE = r'text.journal'
+# write the edits to JOURNAL_FILE and only rewrite FILE every SNAPSHOT_EVERY edits
+JOURNAL = False
+SNAPSHOT_EVERY = 1000
+SAVE_DELAY = 1000
+# files are inserted CHUNK_SIZE bytes per idle callback, files bigger than LARGE_FILE are shown read only,
+# PAGE_SIZE bytes at a time
+CHUNK_SIZE = 64 * 1024
+LARGE_FILE = 8 * 1024 * 1024
+PAGE_SIZE = 256 * 1024
+
+
+def _digest(content: str) -> str:
+    return digest(content.encode('utf-8', 'surrogatepass')).hex()
 
 
 class F(MyFrame):
+    """Notes, saved SAVE_DELAY ms after the last edit (nothing runs while idle).
+    * the file is written atomically (temp file + rename)
+    * with JOURNAL, the insert/delete calls of the Text widget are caught by a
+      Tcl command proxy and appended to JOURNAL_FILE, the whole file is only
+      rewritten every SNAPSHOT_EVERY edits. The journal starts with the hash of
+      the snapshot it applies to and is replayed on load
+    * the file is memory mapped and inserted progressively, one chunk per
+      idle callback, the widget is read only (and not saved) until the end.
+      Above LARGE_FILE it is opened read only, one page at a time
+
+    """
+
     def __init__(self, parent, controller):
         Frame.__init__(self, parent)
         self.parent = parent
@@ -19,7 +48,10 @@ class F(MyFrame):
         self.f = Frame(self)
         self.t = Text(self.f)
         self.t.pack()
-        self.state = None
+        self.pending = None
+        self.edits = []
+        self.journaled = 0
+        self.base = None
 
     def get_types(self) -> List[Type[Event]]:
         return []
@@ -31,22 +63,144 @@ class F(MyFrame):
     def get_name():
         return 'T'
 
+    def on_modified(self, event=None):
+        if not self.t.edit_modified():
+            return
+        # reset at once so that the next edit fires <<Modified>> again
+        self.t.edit_modified(False)
+        if self.pending is not None:
+            self.after_cancel(self.pending)
+        self.pending = self.after(SAVE_DELAY, self.save)
+
     def save(self):
-        content = self.t.get('1.0', 'end')
-        if content != self.state:
-            print('Saving')
-            self.state = content
-            with open(FILE, 'w') as f:
-                f.write(content)
-        self.controller.master.after(4000, self.save)
+        self.pending = None
+        if JOURNAL and self.base is not None and self.journaled + len(self.edits) < SNAPSHOT_EVERY:
+            with open(JOURNAL_FILE, 'a') as f:
+                f.writelines(json.dumps(edit) + '\n' for edit in self.edits)
+            self.journaled += len(self.edits)
+            self.edits.clear()
+            return
+        content = self.t.get('1.0', 'end-1c')
+        atomic_write(FILE, content)
+        if JOURNAL:
+            self.base = _digest(content)
+            atomic_write(JOURNAL_FILE, json.dumps({'base': self.base}) + '\n')
+            self.journaled = 0
+            self.edits.clear()
+
+    def flush(self, event=None):
+        if self.pending is not None:
+            self.after_cancel(self.pending)
+            self.save()
 
     def load(self):
-        if os.path.exists(FILE):
-            with open(FILE, 'r') as f:
-                self.t.insert('1.0', ''.join(f.readlines()))
         self.f.pack()
         self.b.pack_forget()
-        self.controller.master.after(4000, self.save)
+        size = os.path.getsize(FILE) if os.path.exists(FILE) else 0
+        self.t.configure(state='disabled')
+        if size > LARGE_FILE:
+            self.open_paged(size)
+        else:
+            self.chunks = self.read_chunks(size)
+            self.after_idle(self.load_chunk)
+
+    def read_chunks(self, size: int):
+        if size == 0:
+            return
+        decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        carry = ''
+        with open(FILE, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for start in range(0, size, CHUNK_SIZE):
+                final = start + CHUNK_SIZE >= size
+                chunk = carry + decoder.decode(mm[start:start + CHUNK_SIZE], final)
+                # keep a trailing \r for the next chunk, it may start with \n
+                carry = chunk[-1:] if chunk.endswith('\r') and not final else ''
+                yield chunk[:len(chunk) - len(carry)].replace('\r\n', '\n')
+
+    def load_chunk(self):
+        chunk = next(self.chunks, None)
+        self.t.configure(state='normal')
+        if chunk is None:
+            self.loaded()
+            return
+        self.t.insert('end-1c', chunk)
+        self.t.configure(state='disabled')
+        self.after_idle(self.load_chunk)
+
+    def loaded(self):
+        if JOURNAL:
+            self.replay(self.t.get('1.0', 'end-1c'))
+            self.install_proxy()
+        self.t.edit_modified(False)
+        self.t.bind('<<Modified>>', self.on_modified)
+        self.t.bind('<Destroy>', self.flush)
+
+    def open_paged(self, size: int):
+        """Read only: saving would write the shown page over the whole file."""
+        with open(FILE, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.pages = -(-size // PAGE_SIZE)
+        nav = Frame(self)
+        Button(nav, text='<', command=lambda: self.show_page(self.page - 1)).pack(side='left')
+        Label(nav, textvariable=self.file).pack(side='left', expand=True)
+        Button(nav, text='>', command=lambda: self.show_page(self.page + 1)).pack(side='left')
+        nav.pack(before=self.f, fill='x')
+        self.bind('<Destroy>', lambda e: self.mm.close() if e.widget is self else None)
+        self.show_page(0)
+
+    def _line_start(self, offset: int) -> int:
+        if offset <= 0:
+            return 0
+        i = self.mm.find(b'\n', offset)
+        return len(self.mm) if i == -1 else i + 1
+
+    def show_page(self, page: int):
+        if not 0 <= page < self.pages:
+            return
+        self.page = page
+        start, end = self._line_start(page * PAGE_SIZE), self._line_start((page + 1) * PAGE_SIZE)
+        self.file.set(f'{FILE} {page + 1}/{self.pages} (read only)')
+        self.t.configure(state='normal')
+        self.t.delete('1.0', 'end')
+        self.t.insert('1.0', self.mm[start:end].decode('utf-8', 'replace').replace('\r\n', '\n'))
+        self.t.configure(state='disabled')
+
+    def replay(self, content: str):
+        if not os.path.exists(JOURNAL_FILE):
+            return
+        with open(JOURNAL_FILE, 'r') as f:
+            lines = f.readlines()
+        if not lines or json.loads(lines[0]).get('base') != _digest(content):
+            return
+        self.base = _digest(content)
+        for line in lines[1:]:
+            try:
+                edit = json.loads(line)
+            except ValueError:  # torn last line
+                break
+            if edit[0] == 'insert':
+                self.t.insert(edit[1], edit[2])
+            else:
+                self.t.delete(*edit[1:])
+            self.journaled += 1
+
+    def install_proxy(self):
+        widget = str(self.t)
+        original = widget + '_original'
+        self.tk.call('rename', widget, original)
+
+        def proxy(*args):
+            if args and args[0] in ('insert', 'delete') and len(args) > 1:
+                if args[0] == 'insert':
+                    edit = ['insert', str(self.tk.call(original, 'index', args[1])), ''.join(args[2::2])]
+                else:
+                    edit = ['delete'] + [str(self.tk.call(original, 'index', i)) for i in args[1:3]]
+                result = self.tk.call((original,) + args)
+                self.edits.append(edit)
+                return result
+            return self.tk.call((original,) + args)
+
+        self.tk.createcommand(widget, proxy)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,57 @@
+from tkinter import *
+from tkinter.ttk import *
+from typing import List, Type
+
+from app import *
+
+REFRESH_RATE = 1000
+COLUMNS = ['count', 'mean_ms', 'p50_ms', 'p99_ms', 'max_ms']
+
+
+class F(MyFrame):
+    def __init__(self, parent, controller):
+        Frame.__init__(self, parent)
+        self.parent = parent
+        self.controller = controller
+        Button(self, text='Reset', command=self.reset).pack()
+        self.tree = Treeview(self, columns=COLUMNS)
+        self.tree.heading('#0', text='event/span', anchor='w')
+        self.tree.column('#0', width=120)
+        for c in COLUMNS:
+            self.tree.heading(c, text=c, anchor='e')
+            self.tree.column(c, width=50, anchor='e')
+        self.tree.pack(expand=True, fill='both')
+        self.refresh()
+
+    def get_types(self) -> List[Type[Event]]:
+        return []
+
+    def process(self, message: Event):
+        pass
+
+    @staticmethod
+    def get_name():
+        return 'Trace'
+
+    def reset(self):
+        tracer.sink.reset()
+        self.tree.delete(*self.tree.get_children())
+
+    def refresh(self):
+        # only the in memory sink can be displayed
+        if hasattr(tracer.sink, 'snapshot'):
+            for key, summary in sorted(tracer.sink.snapshot()['histograms'].items()):
+                values = [summary['count']] + ['{:.2f}'.format(summary[c]) for c in COLUMNS[1:]]
+                if self.tree.exists(key):
+                    self.tree.item(key, values=values)
+                else:
+                    self.tree.insert('', END, iid=key, text=key, values=values)
+        self.after(REFRESH_RATE, self.refresh)
+
+
+if __name__ == '__main__':
+    root = Tk()
+    m = Frame(root)
+    m.pack(expand=True, fill='both')
+    F(m, m).pack(expand=True, fill='both')
+    root.mainloop()
@@ -1,10 +1,15 @@
+import logging
 from threading import Thread
 
-from app import launch_ui, process_message_from_ui, workers
+from app import launch_ui, process_message_from_ui, workers, registry
 
-import plugins
-get_message_thread = Thread(target=process_message_from_ui)
-get_message_thread.daemon = True
-get_message_thread.start()
-# ui_out_queue.put(CreateServerEvent('8888'))
-launch_ui()
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    registry.discover()
+    # the other plugins are imported when their frame is first shown
+    registry.load(autostart_only=True, parallel=True)
+    get_message_thread = Thread(target=process_message_from_ui)
+    get_message_thread.daemon = True
+    get_message_thread.start()
+    # ui_out_queue.put(CreateServerEvent('8888'))
+    launch_ui()
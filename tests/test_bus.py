@@ -0,0 +1,94 @@
+from app.bus import Bus
+from app.sinks import CollectSink
+
+
+class Base:
+    pass
+
+
+class Child(Base):
+    pass
+
+
+class Other:
+    pass
+
+
+def test_routes_through_mro():
+    bus = Bus()
+    base, child, everything = CollectSink(), CollectSink(), CollectSink()
+    bus.subscribe(Base, base)
+    bus.subscribe(Child, child)
+    bus.subscribe(object, everything)
+    b, c, o = Base(), Child(), Other()
+    assert bus.publish(b) == 2
+    assert bus.publish(c) == 3
+    assert bus.publish(o) == 1
+    assert list(base.results) == [b, c]
+    assert list(child.results) == [c]
+    assert list(everything.results) == [b, c, o]
+
+
+def test_subscriber_receives_once():
+    bus = Bus()
+    sink = CollectSink()
+    bus.subscribe(Base, sink)
+    bus.subscribe(Child, sink)
+    bus.subscribe(Child, sink)
+    bus.publish(Child())
+    assert len(sink.results) == 1
+
+
+def test_routes_follow_subscriptions():
+    bus = Bus()
+    sink = CollectSink()
+    bus.publish(Child())
+    bus.subscribe(Base, sink)
+    bus.publish(Child())
+    bus.unsubscribe(sink)
+    bus.publish(Child())
+    assert len(sink.results) == 1
+    bus.subscribe(Base, sink)
+    bus.subscribe(Child, sink)
+    bus.unsubscribe(sink, Base)
+    assert bus.route(Base) == ()
+    assert bus.route(Child) == (sink,)
+
+
+def test_none_is_not_published():
+    bus = Bus()
+    sink = CollectSink()
+    bus.subscribe(object, sink)
+    assert bus.publish(None) == 0
+    assert not sink.results and bus.last == {}
+
+
+def test_last_of_replay():
+    bus = Bus()
+    assert bus.last_of(Base) is None
+    c1, c2, b = Child(), Child(), Base()
+    bus.publish(c1)
+    bus.publish(c2)
+    assert bus.last_of(Child) is c2
+    # a subscriber of the base class is replayed the subclass event
+    assert bus.last_of(Base) is c2
+    bus.publish(b)
+    assert bus.last_of(Base) is b
+    assert bus.last_of(Other) is None
+
+
+def test_last_dropped_with_the_last_subscriber():
+    bus = Bus()
+    first, second = CollectSink(), CollectSink()
+    bus.subscribe(Base, first)
+    bus.subscribe(Child, second)
+    c, o = Child(), Other()
+    bus.publish(c)
+    bus.publish(o)
+    bus.unsubscribe(first)
+    # still routed to 'second'
+    assert bus.last_of(Child) is c
+    bus.unsubscribe(second)
+    assert bus.last_of(Child) is None
+    # never subscribed: kept for a later consumer
+    assert bus.last_of(Other) is o
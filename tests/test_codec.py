@@ -0,0 +1,92 @@
+import datetime as dt
+import io
+import itertools
+
+import pytest
+
+from app.codec import codecs_by_type, codecs_by_tag, encode_event, decode_event, write_event, read_events, register_codec
+from app.mini_app import Event
+# every module registering codecs
+import benchmarks.bench_processes  # noqa: F401
+import benchmarks.common  # noqa: F401
+import plugins.graph  # noqa: F401
+import plugins.ok  # noqa: F401
+import plugins.request_async  # noqa: F401
+import plugins.routine  # noqa: F401
+
+EDGE_VALUES = {
+    'i': [0, -1, 2 ** 63 - 1, -2 ** 63],
+    'f': [0.0, -1.5, 1e308, float('inf')],
+    '?': [True, False],
+    't': [dt.datetime(2020, 1, 1, 12, 30, 0, 123456), dt.datetime.fromtimestamp(0)],
+    's': ['', 'a', 'é☃', 'a\0b', '\ud800'],
+    'b': [b'', b'\0\xff'],
+    'S': [[], [''], ['', ''], ['a', '', 'é'], ['x']],
+}
+
+
+def instances(codec):
+    """One event per edge value, the fields cycling through theirs."""
+    fields = codec.fixed + codec.var
+    n = max(len(EDGE_VALUES[kind]) for _, kind in fields)
+    cycles = [itertools.cycle(EDGE_VALUES[kind]) for _, kind in fields]
+    for _ in range(n):
+        event = codec.cls.__new__(codec.cls)
+        for (name, _), values in zip(fields, cycles):
+            setattr(event, name, next(values))
+        yield event
+
+
+def fields(codec, event):
+    return [getattr(event, name) for name, _ in codec.fixed + codec.var]
+
+
+@pytest.mark.parametrize('cls', list(codecs_by_type), ids=lambda cls: f'{cls.__module__}.{cls.__qualname__}')
+def test_round_trip(cls):
+    codec = codecs_by_type[cls]
+    for event in instances(codec):
+        decoded = decode_event(encode_event(event))
+        assert type(decoded) is cls
+        assert fields(codec, decoded) == fields(codec, event)
+
+
+def test_empty_string_list_is_not_empty_list():
+    from plugins.request_async import PRequest
+    assert decode_event(encode_event(PRequest(''.split(',')))).ids == ['']
+    assert decode_event(encode_event(PRequest([]))).ids == []
+
+
+def test_stream():
+    from app.mini_app import NewClipboardInfo, FileUpdateEvent
+    events = [NewClipboardInfo('a'), FileUpdateEvent(['x\n', '']), NewClipboardInfo('')]
+    f = io.BytesIO()
+    for e in events:
+        write_event(f, e)
+    f.seek(0)
+    assert [fields(codecs_by_type[type(e)], e) for e in read_events(f)] == \
+           [fields(codecs_by_type[type(e)], e) for e in events]
+
+
+def test_tag_clash():
+    class A(Event):
+        __slots__ = ('x',)
+
+        @staticmethod
+        def get_repr():
+            return 'A'
+
+    class B(A):
+        pass
+
+    register_codec(A, [('x', 'i')], tag=1)
+    try:
+        with pytest.raises(ValueError):
+            register_codec(B, [('x', 'i')], tag=1)
+    finally:
+        codecs_by_type.pop(A)
+        codecs_by_tag.pop(1)
+
+
+def test_unknown_kind():
+    with pytest.raises(ValueError):
+        register_codec(type('C', (), {}), [('x', 'z')])
@@ -0,0 +1,172 @@
+"""DataGrid data logic, without Tk: the widget parts are replaced by fakes."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.widgets import DataGrid, STAT_NAMES
+
+
+class FakeFooter:
+    def __init__(self):
+        self.rows = {}
+
+    def item(self, iid, values):
+        self.rows[iid] = values
+
+
+def make_grid(df, group_by=None, stats=True):
+    grid = DataGrid.__new__(DataGrid)
+    grid._init_state(group_by, editable=False)
+    grid.footer = FakeFooter() if stats else None
+    grid.render = lambda: None
+    grid._load(df)
+    grid.refresh()
+    grid.compute_stats()
+    return grid
+
+
+def expected_view(grid):
+    df = grid.data.astype(str).apply(lambda s: s.str.lower())
+    mask = np.zeros(len(df), dtype=bool)
+    for c in df.columns:
+        mask |= df[c].str.contains(grid.query.lower(), regex=False).to_numpy()
+    rows = grid.data[mask]
+    if grid.sort_column is not None:
+        rows = rows.sort_values(grid.sort_column, ascending=not grid.sort_reverse, kind='stable')
+    return rows
+
+
+def assert_stats(grid):
+    rows = grid.data.iloc[grid.view]
+    for c in grid.columns:
+        stats = grid.stats[c]
+        s = rows[c].dropna()
+        assert stats['count'] == len(s)
+        if 'sum' in stats:
+            assert stats['sum'] == pytest.approx(s.sum())
+            if len(s):
+                assert stats['min'] == s.min()
+                assert stats['max'] == s.max()
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    n = 500
+    return pd.DataFrame({
+        'a': rng.integers(0, 50, n),
+        'b': rng.choice(['xy', 'zz', 'q'], n),
+        'f': np.where(rng.random(n) < 0.1, np.nan, rng.random(n)),
+    })
+
+
+@pytest.mark.parametrize('reverse', [False, True])
+def test_filter_and_sort(df, reverse):
+    grid = make_grid(df)
+    grid.sort('a')
+    if reverse:
+        grid.sort('a')
+    grid.filter('z')
+    grid.filter('zz')
+    assert sorted(grid.view.tolist()) == sorted(expected_view(grid).index.tolist())
+    keys = df['a'].to_numpy()[grid.view]
+    assert (np.diff(keys) <= 0).all() if reverse else (np.diff(keys) >= 0).all()
+    assert_stats(grid)
+
+
+@pytest.mark.parametrize('sort', [None, 'a'])
+def test_edits_move_rows_in_and_out_of_filter(df, sort):
+    grid = make_grid(df)
+    if sort:
+        grid.sort(sort)
+    grid.filter('zz')
+    rng = np.random.default_rng(1)
+    for _ in range(100):
+        position = int(rng.integers(len(df)))
+        if rng.random() < 0.5:
+            grid.edit(position, 'b', str(rng.choice(['xy', 'zz'])))
+        else:
+            grid.edit(position, 'a', str(rng.integers(0, 50)))
+        assert sorted(grid.view.tolist()) == sorted(expected_view(grid).index.tolist())
+        if sort:
+            assert (np.diff(df['a'].to_numpy()[grid.view]) >= 0).all()
+        assert_stats(grid)
+
+
+def test_edit_of_max_row_leaving_filter(df):
+    grid = make_grid(df)
+    grid.sort('a')
+    grid.filter('zz')
+    position = int(grid.view[-1])
+    grid.edit(position, 'b', 'x')
+    assert position not in grid.view
+    assert_stats(grid)
+
+
+def test_undo_batch(df):
+    grid = make_grid(df)
+    grid.filter('zz')
+    before = df.copy()
+    view = grid.view.copy()
+    grid.set_cells([(0, 'a', 1), (1, 'b', 'q'), (2, 'f', 0.5), (0, 'a', 2)])
+    grid.undo()
+    pd.testing.assert_frame_equal(grid.data, before)
+    assert sorted(grid.view.tolist()) == sorted(view.tolist())
+    assert_stats(grid)
+    assert not grid.undo_log
+
+
+def test_edit_converts_to_column_type(df):
+    grid = make_grid(df)
+    grid.edit(3, 'a', '42')
+    grid.edit(3, 'f', '0.25')
+    assert df['a'].iat[3] == 42 and df['f'].iat[3] == 0.25
+
+
+def test_sort_with_nan_places_edited_row(df):
+    grid = make_grid(df)
+    grid.sort('f')
+    grid.edit(0, 'f', '2')
+    expected = df['f'].sort_values(kind='stable', na_position='last').index.tolist()
+    assert grid.view.tolist() == expected
+
+
+def test_group_by():
+    df = pd.DataFrame({'id': ['u', 'v', 'u', 'w'], 'a': [1, 2, 3, 4]})
+    grid = make_grid(df, group_by='id')
+    assert [(k, p.tolist()) for k, p in grid.groups] == [('u', [0, 2]), ('v', [1]), ('w', [3])]
+    grid.toggle('u')
+    assert grid.display.tolist() == [-1, 0, 2, -2, -3]
+    grid.set_cells([(1, 'id', 'u')])
+    assert [(k, p.tolist()) for k, p in grid.groups] == [('u', [0, 1, 2]), ('w', [3])]
+
+
+def test_footer_rows(df):
+    grid = make_grid(df)
+    assert set(grid.footer.rows) == set(STAT_NAMES)
+    assert grid.footer.rows['count'] == [str(df[c].notna().sum()) for c in grid.columns]
+
+
+class FakeStatus:
+    def configure(self, **kw):
+        pass
+
+    def grid(self, **kw):
+        pass
+
+
+def test_export_sends_a_snapshot(df):
+    from app.mini_app import ui_out_queue
+
+    grid = make_grid(df)
+    grid.status = FakeStatus()
+    # the Tk path, the export progress is routed back with it
+    grid._w = '.grid'
+    grid.sort('a')
+    grid.filter('zz')
+    expected = df.iloc[grid.view].reset_index(drop=True)
+    grid.export('out.csv')
+    request = ui_out_queue.get_nowait()
+    grid.set_cells([(int(p), 'a', -1) for p in grid.view[:10]])
+    rows = request.data.iloc[request.positions][request.columns].reset_index(drop=True)
+    pd.testing.assert_frame_equal(rows, expected)
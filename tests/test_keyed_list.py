@@ -0,0 +1,79 @@
+"""KeyedList reconciliation, with fake widgets standing for the packed Labels."""
+import random
+
+from app.widgets import KeyedList, _stable_positions
+
+
+class FakeWidget:
+    def __init__(self, packing, item):
+        self.packing = packing
+        self.item = item
+        self.packs = 0
+        self.destroyed = False
+
+    def pack(self, after):
+        if self in self.packing:
+            self.packing.remove(self)
+        self.packing.insert(self.packing.index(after) + 1, self)
+        self.packs += 1
+
+    def destroy(self):
+        self.packing.remove(self)
+        self.destroyed = True
+
+
+def make_list():
+    kl = KeyedList.__new__(KeyedList)
+    kl._init_state(lambda item: item)
+    kl.packing = []
+    kl._head = FakeWidget(kl.packing, None)
+    kl.packing.append(kl._head)
+    kl.create = lambda item: FakeWidget(kl.packing, item)
+    return kl
+
+
+def shown(kl):
+    return [w.item for w in kl.packing[1:]]
+
+
+def test_stable_positions_is_longest_increasing():
+    assert _stable_positions([]) == set()
+    assert _stable_positions([0, 1, 2]) == {0, 1, 2}
+    assert len(_stable_positions([2, 0, 1, -1, 3])) == 3
+    seq = [3, -1, 0, 4, 1, 2]
+    stable = sorted(_stable_positions(seq))
+    values = [seq[i] for i in stable]
+    assert values == sorted(values) and len(values) == 3
+
+
+def test_reuses_widgets_and_moves_few():
+    kl = make_list()
+    kl.set_items(['a', 'b', 'c', 'd', 'e'])
+    widgets = dict(kl.widgets)
+    for w in widgets.values():
+        w.packs = 0
+    kl.set_items(['a', 'c', 'd', 'e', 'b', 'f'])
+    assert shown(kl) == ['a', 'c', 'd', 'e', 'b', 'f']
+    assert all(kl.widgets[k] is widgets[k] for k in widgets)
+    # only 'b' moved
+    assert [k[0] for k, w in widgets.items() if w.packs] == ['b']
+
+
+def test_removed_and_duplicates():
+    kl = make_list()
+    kl.set_items(['x', 'y', 'x'])
+    first_x = kl.widgets[('x', 0)]
+    kl.set_items(['x', 'z'])
+    assert shown(kl) == ['x', 'z']
+    assert kl.widgets[('x', 0)] is first_x
+    assert len(kl.widgets) == 2
+
+
+def test_random_reconciliation():
+    rng = random.Random(0)
+    kl = make_list()
+    for _ in range(200):
+        items = [rng.choice('abcdefghij') for _ in range(rng.randint(0, 12))]
+        kl.set_items(items)
+        assert shown(kl) == items
+        assert len(kl.widgets) == len(items)
@@ -0,0 +1,176 @@
+import asyncio
+
+import pytest
+
+import app.scheduler as scheduler
+from app.mini_app import Event, Subscriber
+from app.scheduler import SubscriberScheduler, visibility, _Entry
+
+
+class E(Event):
+    __slots__ = ('n',)
+
+    def __init__(self, n):
+        self.n = n
+
+    @staticmethod
+    def get_repr():
+        return 'E'
+
+
+class Other(Event):
+    @staticmethod
+    def get_repr():
+        return 'OTHER'
+
+
+class S(Subscriber):
+    # not registered: no WorkerMeta
+    def __init__(self, period=1.0, changes=0):
+        super().__init__([])
+        self.period = period
+        self.changes = changes
+        self.polls = 0
+        # set to hold the poll in '_get_update'
+        self.gate = None
+
+    def get_type(self):
+        return E
+
+    def seconds_before_next_update(self):
+        return self.period
+
+    async def _get_update(self):
+        self.polls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        return E(self.polls) if self.polls <= self.changes else None
+
+
+@pytest.fixture
+def fast(monkeypatch):
+    monkeypatch.setattr(scheduler, 'FIRST_POLL_DELAY', 0)
+    monkeypatch.setattr(scheduler, 'MIN_INTERVAL', 0.01)
+    yield
+    visibility.forget('test')
+
+
+def add(sched, sub):
+    # what Subscriber.start does, without the worker loop
+    sub.scheduler = sched
+    sched.add(sub)
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_backoff_and_speed_up():
+    async def main():
+        sub = S(period=1.0, changes=1)
+        sched = SubscriberScheduler(asyncio.get_event_loop())
+        entry = _Entry(sub, 0)
+        intervals = []
+        for _ in range(6):
+            await sched._poll(entry)
+            intervals.append(entry.interval)
+        return intervals
+
+    assert run(main()) == pytest.approx([0.5, 0.75, 1.125, 1.6875, 2.53125, 3.796875])
+    # capped at MAX_IDLE_FACTOR times the period
+    async def capped():
+        sub = S(period=1.0)
+        entry = _Entry(sub, 0)
+        sched = SubscriberScheduler(asyncio.get_event_loop())
+        for _ in range(20):
+            await sched._poll(entry)
+        return entry.interval
+
+    assert run(capped()) == scheduler.MAX_IDLE_FACTOR
+
+
+def test_coalesced_wakeups(fast):
+    async def main():
+        sched = SubscriberScheduler.of(asyncio.get_event_loop())
+        subs = [S(period=0.05 + 0.01 * i) for i in range(5)]
+        for sub in subs:
+            add(sched, sub)
+        await asyncio.sleep(0.5)
+        sched.task.cancel()
+        return sched, subs
+
+    sched, subs = run(main())
+    assert all(sub.polls >= 2 for sub in subs)
+    assert sched.wakeups < sched.polls
+
+
+def test_pause_wake_and_resume(fast):
+    async def main():
+        sched = SubscriberScheduler.of(asyncio.get_event_loop())
+        sub = S(period=0.02)
+        visibility.show('test', [Other])
+        add(sched, sub)
+        await asyncio.sleep(0.2)
+        paused = sub.polls
+        sub.wake()
+        await asyncio.sleep(0.05)
+        woken = sub.polls
+        visibility.show('test', [Event])
+        await asyncio.sleep(0.01)
+        resumed = sub.polls
+        sched.task.cancel()
+        return paused, woken, resumed
+
+    assert run(main()) == (0, 1, 2)
+
+
+def test_not_pausable(fast):
+    async def main():
+        sched = SubscriberScheduler.of(asyncio.get_event_loop())
+        sub = S(period=0.02)
+        sub.pausable = False
+        visibility.hide('test')
+        add(sched, sub)
+        await asyncio.sleep(0.1)
+        sched.task.cancel()
+        return sub.polls
+
+    assert run(main()) > 0
+
+
+def test_wake_during_poll_is_kept(fast):
+    async def main():
+        sched = SubscriberScheduler.of(asyncio.get_event_loop())
+        sub = S(period=10)
+        sub.gate = asyncio.Event()
+        add(sched, sub)
+        await asyncio.sleep(0.05)
+        assert sub.polls == 1
+        sub.wake()
+        await asyncio.sleep(0.01)
+        sub.gate.set()
+        await asyncio.sleep(0.05)
+        sched.task.cancel()
+        return sub.polls
+
+    assert run(main()) == 2
+
+
+def test_slow_poll_does_not_block_others(fast):
+    async def main():
+        sched = SubscriberScheduler.of(asyncio.get_event_loop())
+        slow, quick = S(period=0.02), S(period=0.02)
+        slow.gate = asyncio.Event()
+        add(sched, slow)
+        add(sched, quick)
+        await asyncio.sleep(0.2)
+        sched.task.cancel()
+        slow.gate.set()
+        return slow.polls, quick.polls
+
+    slow, quick = run(main())
+    assert slow == 1 and quick > 2